@@ -0,0 +1,194 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import pygame
+
+from FrameProfiler import PROFILER
+
+
+class AssetManager:
+    """
+    One cache for every image, sound and font the game uses.
+    - Assets load lazily on first request, relative to the game folder.
+    - Scaled image variants are cached per target size next to the source image.
+    - Everything lives in one LRU; once `budget_bytes` is exceeded the least
+      recently used entries are evicted (callers keep whatever they still hold).
+    - hits / misses / evictions are counted for the profiler; lookups of a
+      key already known to be missing count as `missing`, not as hits.
+    """
+
+    def __init__(self, base_dir: str, budget_bytes: int = 64 * 1024 * 1024):
+        self.base_dir = base_dir
+        self.budget_bytes = budget_bytes
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.missing = 0
+        self.evictions = 0
+
+        self._entries: "OrderedDict[tuple, Tuple[object, int]]" = OrderedDict()
+        self._unconverted = set()   # image keys preloaded off the main thread
+        self._missing = set()       # keys that failed to load (don't re-probe disk)
+        self._paths = {}
+        self._lock = threading.RLock()
+
+    # ---------- Cache plumbing ----------
+    def resolve(self, name: str) -> Optional[str]:
+        """Find a file next to the game first, then relative to the working dir."""
+        if name in self._paths:
+            return self._paths[name]
+        found = None
+        for p in (os.path.join(self.base_dir, name), name):
+            if os.path.exists(p):
+                found = p
+                break
+        self._paths[name] = found
+        return found
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if key in self._missing:
+                self.missing += 1
+                return None
+            self.misses += 1
+            return None
+
+    def _put(self, key, obj, nbytes: int):
+        with self._lock:
+            if obj is None:
+                self._missing.add(key)
+                return None
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes_used -= old[1]
+            self._entries[key] = (obj, nbytes)
+            self.bytes_used += nbytes
+            # Evict oldest first, but never the entry we just stored
+            while self.bytes_used > self.budget_bytes and len(self._entries) > 1:
+                old_key, (_, old_bytes) = self._entries.popitem(last=False)
+                self._unconverted.discard(old_key)
+                self.bytes_used -= old_bytes
+                self.evictions += 1
+            return obj
+
+    @staticmethod
+    def _surface_bytes(surf: pygame.Surface) -> int:
+        return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    # ---------- Images ----------
+    def _load_image(self, name: str, alpha: bool, convert: bool) -> Optional[pygame.Surface]:
+        path = self.resolve(name)
+        if not path:
+            return None
+        try:
+            with PROFILER.section("asset.load"):
+                img = pygame.image.load(path)
+        except Exception:
+            return None
+        if convert and pygame.display.get_surface() is not None:
+            img = img.convert_alpha() if alpha else img.convert()
+        return img
+
+    def _image(self, name, size, alpha, smooth, convert):
+        key = ("image", name, alpha, size, smooth if size else False)
+        img = self._get(key)
+        if img is not None or key in self._missing:
+            if img is not None and convert and key in self._unconverted:
+                img = self._convert(key, img, alpha)
+            return img
+
+        if size is None:
+            img = self._load_image(name, alpha, convert)
+        else:
+            src = self._image(name, None, alpha, False, convert)
+            if src is None:
+                img = None
+            elif smooth:
+                img = pygame.transform.smoothscale(src, size)
+            else:
+                img = pygame.transform.scale(src, size)  # nearest by default in SDL2 builds
+
+        if img is not None and (not convert or pygame.display.get_surface() is None):
+            self._unconverted.add(key)
+        return self._put(key, img, self._surface_bytes(img) if img else 0)
+
+    def _convert(self, key, img: pygame.Surface, alpha: bool) -> pygame.Surface:
+        if pygame.display.get_surface() is None:
+            return img
+        img = img.convert_alpha() if alpha else img.convert()
+        with self._lock:
+            self._unconverted.discard(key)
+        return self._put(key, img, self._surface_bytes(img))
+
+    def image(self, name: str, size: Optional[Tuple[int, int]] = None,
+              alpha: bool = True, smooth: bool = False) -> Optional[pygame.Surface]:
+        """Display-format image, optionally scaled to `size`. None if it can't be loaded."""
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        return self._image(name, size, alpha, smooth, convert=True)
+
+    def preload(self, name: str, size: Optional[Tuple[int, int]] = None,
+                alpha: bool = True, smooth: bool = False) -> bool:
+        """
+        Decode (and scale) an image without touching the display, so it is
+        safe on a loader thread. The next image() call on the main thread
+        converts it to display format.
+        """
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        return self._image(name, size, alpha, smooth, convert=False) is not None
+
+    # ---------- Sounds ----------
+    def sound(self, name: str) -> Optional["pygame.mixer.Sound"]:
+        key = ("sound", name)
+        snd = self._get(key)
+        if snd is not None or key in self._missing:
+            return snd
+        path = self.resolve(name)
+        snd, nbytes = None, 0
+        if path and pygame.mixer.get_init():
+            try:
+                with PROFILER.section("asset.load"):
+                    snd = pygame.mixer.Sound(path)
+                freq, fmt, channels = pygame.mixer.get_init()
+                nbytes = int(snd.get_length() * freq) * channels * abs(fmt) // 8
+            except Exception:
+                snd = None
+        return self._put(key, snd, nbytes)
+
+    # ---------- Fonts ----------
+    def font(self, name: str, size: int, fallback: str = "georgia", bold: bool = False) -> pygame.font.Font:
+        """TTF from the game folder, or a system font if it isn't there."""
+        key = ("font", name, size, fallback, bold)
+        font = self._get(key)
+        if font is not None:
+            return font
+        path = self.resolve(name)
+        with PROFILER.section("asset.load"):
+            font = pygame.font.Font(path, size) if path else pygame.font.SysFont(fallback, size, bold=bold)
+        return self._put(key, font, os.path.getsize(path) if path else 0)
+
+    # ---------- Stats ----------
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.missing
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes_used,
+                "budget": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "missing": self.missing,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+ASSETS = AssetManager(os.path.dirname(os.path.abspath(__file__)))
@@ -1,6 +1,18 @@
+import os
+import queue
 import re
+import sqlite3
+import threading
 import unicodedata
-from SLM_attempt1 import GameGuide
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from SLM_attempt1 import GameGuide, SYSTEM_PROMPT
+from ConversationMemory import ConversationMemory, refers_back
+from FrameProfiler import PROFILER
+from OfflineGuide import OFFLINE, OFFLINE_TAG, guideline_passages
+from QueryIndex import QueryIndex
+from ResponseCache import ResponseCache
+from SLMScheduler import SCHEDULER
 
 import re
 import unicodedata
@@ -43,17 +55,375 @@ def sanitize_output(text: str) -> str:
 
 
 
-# Initialize your guide
-guide = GameGuide(model="gpt-4o-mini", temperature=0.6)
+# Initialize your guide (None without an API key: every answer comes from OFFLINE)
+try:
+    guide = GameGuide(model="gpt-4o-mini", temperature=0.6, max_retries=0)  # SCHEDULER retries
+except RuntimeError as e:
+    print("AquaGuide is offline:", e)
+    guide = None
+
+OFFLINE.add_passages(guideline_passages(SYSTEM_PROMPT))
+
+# What AquaGuide remembers of this session's chat, sent only with typed
+# follow-ups that need it (see refers_back; ELD_MEMORY_TOKENS is the budget
+# for verbatim recent turns). Questions that stand on their own, and canned
+# prompts (the chat's buttons, registered by prefetch_answers()), go without
+# it so their answers stay shareable through the caches.
+memory = ConversationMemory(budget_tokens=int(os.environ.get("ELD_MEMORY_TOKENS", "600")))
+canned_prompts = set()
+
+# The player's lawn as GameGuide.build_context() reads it; the game replaces
+# it through set_game_state() and it goes into every prompt and cache key.
+# Canned prompts see only the CANNED_STATE part (the lawn's makeup, not the
+# month's numbers), and are fetched again ELD_REFETCH_AFTER seconds after that
+# part settles on something new, so the buttons stay answered in memory
+# without spending requests every month.
+CANNED_STATE = ("grass", "grass_note", "watering")
+REFETCH_AFTER_S = float(os.environ.get("ELD_REFETCH_AFTER", "2"))
+_game_state: Dict[str, object] = {}
+_canned_state: Dict[str, object] = {}
+_refetch: Optional[threading.Timer] = None
+
+
+def set_game_state(game_state: Optional[Dict[str, object]]):
+    """
+    Tell AquaGuide about the player's lawn. Pass the same dict again while
+    nothing changed: its hints are only rebuilt for a different one.
+    """
+    global _game_state, _canned_state, _refetch
+    _game_state = game_state or {}
+    canned_state = {k: v for k, v in _game_state.items() if k in CANNED_STATE}
+    if canned_state == _canned_state:
+        return
+    _canned_state = canned_state
+    if guide is None or not canned_prompts:
+        return
+    if _refetch is not None:
+        _refetch.cancel()   # still changing: wait for it to settle
+    _refetch = threading.Timer(REFETCH_AFTER_S, prefetch_answers, args=(sorted(canned_prompts),),
+                               kwargs={"workers": 1})
+    _refetch.daemon = True
+    _refetch.start()
+
+
+def _state_for(user_input: str) -> Dict[str, object]:
+    return _canned_state if user_input in canned_prompts else _game_state
+
+# When the model has said nothing after this many seconds, answer offline
+# instead (ELD_OFFLINE_AFTER=<seconds>); its late answer is still cached
+OFFLINE_AFTER_S = float(os.environ.get("ELD_OFFLINE_AFTER", "3"))
+
+# Answers are cached on disk, so a canned prompt costs one API call per
+# classroom rather than one per click. ELD_RESPONSE_CACHE=<path> moves the
+# file (point every machine at a shared one), =off disables it;
+# ELD_RESPONSE_VARIANTS=<n> keeps n different answers per question. The file
+# is opened on the first lookup, not on import.
+_cache_path = os.environ.get("ELD_RESPONSE_CACHE") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "aquaguide_cache.sqlite3")
+_responses: Optional[ResponseCache] = None
+_responses_opened = False
+_responses_lock = threading.Lock()
+
+
+def _response_cache() -> Optional[ResponseCache]:
+    global _responses, _responses_opened
+    with _responses_lock:
+        if not _responses_opened:
+            _responses_opened = True
+            try:
+                _responses = None if _cache_path == "off" else ResponseCache(
+                    _cache_path, variants_per_key=int(os.environ.get("ELD_RESPONSE_VARIANTS", "1")))
+            except (sqlite3.Error, ValueError) as e:
+                print("AquaGuide response cache disabled:", e)
+    return _responses
+
+
+# Paraphrases of a cached question ("how frequently should I water") reuse its
+# answer when their similarity reaches ELD_SEMANTIC_THRESHOLD (=off disables).
+# The index is rebuilt from the cache file on first use, off the main thread.
+_semantic_threshold = os.environ.get("ELD_SEMANTIC_THRESHOLD", "0.8")
+_similar: Optional[QueryIndex] = None
+_similar_lock = threading.Lock()
+
+
+def _query_index() -> Optional[QueryIndex]:
+    global _similar
+    responses = _response_cache()
+    if responses is None or _semantic_threshold == "off":
+        return None
+    with _similar_lock:
+        if _similar is None:
+            index = QueryIndex(threshold=float(_semantic_threshold))
+            with PROFILER.section("slm.semantic_load"):
+                index.extend(responses.queries())
+            _similar = index
+    return _similar
+
+
+def _is_answer(text: str) -> bool:
+    """Errors and empty results are reported as text too, but must not be cached."""
+    return ("[Error contacting SLM" not in text and not text.startswith("[No valid response")
+            and not text.startswith(OFFLINE_TAG))
+
+
+# Answers already seen this session (prefetched or asked), checked before the disk
+WARM_MAX = 256
+_warm: "OrderedDict[str, str]" = OrderedDict()
+_warm_lock = threading.Lock()
+
+
+def _cache_keys(user_input: str, game_state: Optional[Dict[str, object]] = None) -> Tuple[str, str]:
+    """
+    (key, scope) of user_input asked with game_state (default: its current
+    one). The scope is the key of everything but the question: near-duplicates
+    only match within it. Both are taken once, when the question is asked, so
+    an answer is stored under the state it was asked with.
+    """
+    context = guide.build_context(_state_for(user_input) if game_state is None else game_state)
+    key = lambda question: ResponseCache.key(guide.model, guide.temperature, SYSTEM_PROMPT, context, question)
+    return key(user_input), key("")
+
+
+def _lookup_similar(user_input: str, scope: str) -> Optional[str]:
+    index = _query_index()
+    if index is None:
+        return None
+    with PROFILER.section("slm.semantic_lookup"):
+        found = index.match(user_input, scope)
+    return _response_cache().lookup(found[0]) if found else None
+
+
+def _remember(key: str, text: str):
+    with _warm_lock:
+        _warm[key] = text
+        _warm.move_to_end(key)
+        while len(_warm) > WARM_MAX:
+            _warm.popitem(last=False)
+
+
+def _history(user_input: str) -> List[Dict[str, str]]:
+    if user_input in canned_prompts or not len(memory) or not refers_back(user_input):
+        return []
+    return memory.messages()
+
+
+def remember_turn(user_input: str, text: str):
+    """Add a shown answer to the conversation memory (errors aren't worth remembering)."""
+    if text.startswith(OFFLINE_TAG):
+        text = text[len(OFFLINE_TAG):]
+    elif not _is_answer(text):
+        return
+    memory.add_turn(user_input, text)
+
+
+def cached_answer(user_input: str) -> Optional[str]:
+    """
+    An answer already in memory, without touching the disk or the network
+    (None if not, or if the question would be asked with conversation memory).
+    """
+    if guide is None or _history(user_input):
+        return None
+    return _warm_answer(_cache_keys(user_input)[0])
+
+
+def _warm_answer(key: str) -> Optional[str]:
+    with _warm_lock:
+        text = _warm.get(key)
+        if text is not None:
+            _warm.move_to_end(key)
+    return text
+
+
+def _through_cache(user_input: str, keys: Tuple[str, str], produce: Callable[[], str],
+                   on_hit: Callable[[str], None] = None) -> str:
+    """
+    Answer from the cache, or produce() it once (concurrent askers wait) and
+    store it under `keys` (_cache_keys() of the question as it was asked).
+    """
+    key, scope = keys
+    text = _warm_answer(key)
+    hit = text is not None
+    responses = None if hit else _response_cache()
+    if not hit and responses is None:
+        text = produce()
+    elif not hit:
+        with responses.single_flight(key):
+            text = responses.lookup(key)
+            if text is None:
+                text = _lookup_similar(user_input, scope)
+            hit = text is not None
+            if not hit:
+                text = produce()
+                if _is_answer(text):
+                    _store(keys, user_input, text)
+        PROFILER.set_counter("response cache hit rate", round(responses.stats()["hit_rate"], 3))
+    if _is_answer(text):
+        _remember(key, text)
+    if hit and on_hit is not None:
+        on_hit(text)
+    return text
+
+
+def _store(keys: Tuple[str, str], user_input: str, text: str):
+    """Keep a model answer on disk and in the paraphrase index (memory is _remember's)."""
+    responses = _response_cache()
+    if responses is None:
+        return
+    key, scope = keys
+    responses.store(key, text, query=user_input, scope=scope)
+    index = _query_index()
+    if index is not None:
+        index.add(user_input, key, scope)
+
+
+def _hedged(user_input: str, ask: Callable[[Callable[[str], None]], str],
+            on_text: Callable[[str], None] = None, keys: Optional[Tuple[str, str]] = None) -> str:
+    """
+    Race the model against OFFLINE:
+    - ask(forward) runs on its own thread; if it has produced text (its
+      first streamed chunk, or the whole answer) within OFFLINE_AFTER_S,
+      its answer is used as usual.
+    - Otherwise, or if it fails before saying anything, the offline answer
+      is used at once. A model answer that arrives later is still cached
+      under `keys` (unless None), so the next asker gets it.
+    """
+    lock = threading.Lock()
+    arrived = threading.Event()
+    state = {"hedged": False, "sent": False, "text": None}
+
+    def forward(chunk: str):
+        with lock:
+            if state["hedged"]:
+                return
+            state["sent"] = True
+            arrived.set()
+        if on_text is not None:
+            on_text(chunk)
+
+    def run():
+        text = ask(forward)
+        with lock:
+            state["text"] = text
+            late = state["hedged"]
+            arrived.set()
+        if late and keys is not None and _is_answer(text):
+            _store(keys, user_input, text)
+            _remember(keys[0], text)
+
+    worker = threading.Thread(target=run, name="slm-remote", daemon=True)
+    worker.start()
+    arrived.wait(OFFLINE_AFTER_S)
+    with lock:
+        state["hedged"] = not arrived.is_set()
+    if not state["hedged"]:
+        worker.join()
+        if _is_answer(state["text"]) or state["sent"]:
+            return state["text"]
+
+    text = OFFLINE.answer(user_input)
+    if on_text is not None:
+        on_text(text)
+    return text
+
+
+def warm_up() -> Optional[threading.Thread]:
+    """Import the SDK and connect to the API in the background (None when offline)."""
+    return guide.warm_up() if guide is not None else None
+
+
+# Prefetching stops while fewer than this many of the session's requests are left
+PREFETCH_RESERVE = 30
+
+
+def prefetch_answers(prompts: Iterable[str], workers: int = 2) -> List[threading.Thread]:
+    """
+    Fetch answers for `prompts` in the background, at most `workers` at a
+    time, so they are in memory (cached_answer) before anyone asks. They
+    are registered as canned prompts, asked without conversation memory
+    and with only the CANNED_STATE part of the game state. The requests
+    are SCHEDULER background ones: a player's question always goes first.
+    """
+    prompts = list(prompts)
+    canned_prompts.update(prompts)
+    if guide is None:
+        return []   # offline answers are instant anyway
+    todo: "queue.Queue[str]" = queue.Queue()
+    for p in prompts:
+        todo.put(p)
+
+    def work():
+        while True:
+            try:
+                prompt = todo.get_nowait()
+            except queue.Empty:
+                return
+            if SCHEDULER.session_quota - SCHEDULER.used <= PREFETCH_RESERVE:
+                return   # what is left is the player's
+            if cached_answer(prompt) is None:
+                # Not a turn of the conversation, and not hedged: nobody is waiting, so the
+                # worker waits for the model (which is what caps requests at `workers`)
+                game_state = _state_for(prompt)
+                with PROFILER.section("slm.prefetch"):
+                    _through_cache(prompt, _cache_keys(prompt, game_state),
+                                   lambda: _ask(prompt, game_state=game_state, background=True))
+
+    threads = [threading.Thread(target=work, name=f"slm-prefetch-{i}", daemon=True) for i in range(workers)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def _answer(user_input: str, on_text: Callable[[str], None] = None) -> str:
+    """
+    The answer to one question, streamed to on_text() if given. Questions
+    sent with conversation memory skip the caches: their answers depend on
+    the chat so far.
+    """
+    if guide is None:
+        text = OFFLINE.answer(user_input)
+        if on_text is not None:
+            on_text(text)
+        return text
+    history = _history(user_input)
+    game_state = _state_for(user_input)
+    if on_text is None:
+        ask = lambda forward: _ask(user_input, history, game_state)
+    else:
+        ask = lambda forward: _ask_streaming(user_input, forward, history, game_state)
+    if history:
+        return _hedged(user_input, ask, on_text)
+    keys = _cache_keys(user_input, game_state)
+    return _through_cache(user_input, keys, lambda: _hedged(user_input, ask, on_text, keys), on_hit=on_text)
 
 
 def chat_with_slm(user_input: str) -> str:
     """
-    Send a prompt to GameGuide and return a sanitized response.
+    Send a prompt to GameGuide and return a sanitized response (or the
+    offline one when the model is missing, failing or slow).
     """
+    text = _answer(user_input)
+    remember_turn(user_input, text)
+    return text
+
+
+def stream_chat_with_slm(user_input: str, on_text: Callable[[str], None]) -> str:
+    """
+    Streaming chat_with_slm(): each sanitized chunk goes to on_text() as it
+    arrives, and the whole sanitized answer is returned at the end. A cached
+    answer, like an offline one, arrives as one chunk.
+    """
+    text = _answer(user_input, on_text)
+    remember_turn(user_input, text)
+    return text
+
+
+def _ask(user_input: str, history: List[Dict[str, str]] = None,
+         game_state: Dict[str, object] = None, background: bool = False) -> str:
     try:
         # Your GameGuide exposes generate_tip(), so use that
-        raw = guide.generate_tip(user_input)
+        with PROFILER.section("slm.round_trip"):
+            raw = SCHEDULER.call(lambda: guide.generate_tip(user_input, game_state, history=history),
+                                 background=background)
 
         # Clean the output for pygame safety
         cleaned = sanitize_output(raw)
@@ -63,6 +433,26 @@ def chat_with_slm(user_input: str) -> str:
         return sanitize_output(f"[Error contacting SLM: {e.__class__.__name__}: {e}]")
 
 
+def _ask_streaming(user_input: str, on_text: Callable[[str], None],
+                   history: List[Dict[str, str]] = None, game_state: Dict[str, object] = None) -> str:
+    parts = []
+    try:
+        with SCHEDULER.slot(), PROFILER.section("slm.round_trip"):
+            for delta in SCHEDULER.with_retries(lambda: guide.stream_tip(user_input, game_state, history=history)):
+                chunk = sanitize_output(delta)
+                if not parts:
+                    chunk = chunk.lstrip()
+                if chunk:
+                    parts.append(chunk)
+                    on_text(chunk)
+    except Exception as e:
+        error = sanitize_output(f"[Error contacting SLM: {e.__class__.__name__}: {e}]")
+        return "".join(parts).rstrip() + ("\n" if parts else "") + error
+
+    cleaned = "".join(parts).rstrip()
+    return cleaned if cleaned.strip() else "[No valid response after sanitization]"
+
+
 # Optional console loop
 if __name__ == "__main__":
     print("AquaGuide is online! Type 'quit' to exit.\n")
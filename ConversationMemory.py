@@ -0,0 +1,109 @@
+import re
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token for English: close enough for budgeting, and no tokenizer needed."""
+    return (len(text) + 3) // 4
+
+
+def _gist(text: str, limit: int = 160, min_words: int = 1) -> str:
+    """First sentence of at least `min_words` words ("Great question!" says nothing), cut to `limit`."""
+    sentences = re.split(r"(?<=[.!?])\s+", text.strip())
+    sentence = next((s for s in sentences if len(s.split()) >= min_words), sentences[0])
+    return sentence if len(sentence) <= limit else sentence[:limit].rsplit(" ", 1)[0] + "..."
+
+
+# What makes a question point back at the chat so far: a follow-up opening
+# ("what about in summer?", "and the aquifer?"), a pronoun with nothing in the
+# question to refer to ("why is that?", "are they drought-tolerant?"), or a
+# phrase about the earlier answer ("you said..."). Pronouns anywhere else
+# ("is it OK to...", "grass that needs...") usually have their antecedent
+# right there, so they don't count.
+_FOLLOW_UP_START = re.compile(r"^\W*(what about|how about|and|also|but|so|then|same)\b", re.I)
+_FOLLOW_UP_END = re.compile(r"\b(it|that|this|these|those|them|they)\W*$", re.I)
+_FOLLOW_UP_SUBJECT = re.compile(
+    r"^\W*(?:(?:how|why|what|when|where)\s+)?(?:is|are|was|were|do|does|did|will|would|can|could|should)"
+    r"\s+(?:that|this|these|those|they)\b", re.I)
+_FOLLOW_UP_PHRASE = re.compile(r"\b(you said|you mentioned|tell me more|what else|anything else)\b", re.I)
+
+
+def refers_back(question: str) -> bool:
+    """Whether a question needs the earlier turns to make sense (see _FOLLOW_UP_*)."""
+    return any(p.search(question) for p in (_FOLLOW_UP_START, _FOLLOW_UP_END,
+                                             _FOLLOW_UP_SUBJECT, _FOLLOW_UP_PHRASE))
+
+
+class ConversationMemory:
+    """
+    What AquaGuide remembers of the chat, so follow-ups ("what about in
+    summer?") keep their context without the prompt growing all session.
+    - The most recent turns are sent verbatim while they fit in
+      `budget_tokens` (estimated locally, see estimate_tokens).
+    - Older turns are compacted into a rolling summary (the question and
+      the answer's first real sentence), itself capped at `summary_tokens`
+      by dropping its oldest points.
+    - messages() is rebuilt only when a turn is added, so assembling the
+      prompt costs the same on the first question and the hundredth.
+    """
+
+    def __init__(self, budget_tokens: int = 600, summary_tokens: int = 150):
+        self.budget_tokens = budget_tokens
+        self.summary_tokens = summary_tokens
+        self._lock = threading.Lock()
+        self._turns: Deque[Tuple[str, str, int]] = deque()   # (question, answer, tokens)
+        self._turn_tokens = 0
+        self._summary: Deque[Tuple[str, int]] = deque()      # (point, tokens)
+        self._summary_used = 0
+        self._messages: List[Dict[str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def add_turn(self, question: str, answer: str):
+        tokens = estimate_tokens(question) + estimate_tokens(answer)
+        with self._lock:
+            self._turns.append((question, answer, tokens))
+            self._turn_tokens += tokens
+            # Always keep the latest turn, however long
+            while self._turn_tokens > self.budget_tokens and len(self._turns) > 1:
+                old_q, old_a, old_tokens = self._turns.popleft()
+                self._turn_tokens -= old_tokens
+                self._summarize(old_q, old_a)
+            self._messages = self._assemble()
+
+    def _summarize(self, question: str, answer: str):
+        point = f'Asked "{_gist(question, 100)}"; told: {_gist(answer, min_words=5)}'
+        tokens = estimate_tokens(point) + 1
+        self._summary.append((point, tokens))
+        self._summary_used += tokens
+        while self._summary_used > self.summary_tokens and len(self._summary) > 1:
+            self._summary_used -= self._summary.popleft()[1]
+
+    def _assemble(self) -> List[Dict[str, str]]:
+        messages = []
+        if self._summary:
+            messages.append({"role": "system", "content": "Earlier in this chat: "
+                             + " ".join(point for point, _ in self._summary)})
+        for question, answer, _ in self._turns:
+            messages.append({"role": "user", "content": question})
+            messages.append({"role": "assistant", "content": answer})
+        return messages
+
+    def messages(self) -> List[Dict[str, str]]:
+        """The remembered conversation as Responses input messages (shared; don't modify)."""
+        return self._messages
+
+    def tokens(self) -> int:
+        """Estimated size of messages()."""
+        return sum(estimate_tokens(m["content"]) for m in self._messages)
+
+    def clear(self):
+        with self._lock:
+            self._turns.clear()
+            self._turn_tokens = 0
+            self._summary.clear()
+            self._summary_used = 0
+            self._messages = []
@@ -1,32 +1,54 @@
 import os
 import sys
 import random
+import threading
+import tempfile
+import time
 import pygame
 from dataclasses import dataclass, field
-from typing import Callable, List, Tuple
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
 from enum import Enum
 
+try:
+    import numpy  # needed by pygame.surfarray for the continuous lawn tint
+except ImportError:
+    numpy = None
+
+try:
+    from pygame._sdl2 import video as sdl2_video  # optional texture renderer
+except ImportError:
+    sdl2_video = None
+
+from AssetManager import ASSETS
+from FrameProfiler import PROFILER
+from OfflineGuide import OFFLINE
+from SLMDispatcher import SLM_CHUNK, SLM_REPLY, SLMDispatcher
+
 
 # --------------------------- Optional SLM import ---------------------------
 try:
-    from ChatWithSLMNew import chat_with_slm
+    from ChatWithSLMNew import (cached_answer, chat_with_slm, prefetch_answers, remember_turn,
+                                set_game_state, stream_chat_with_slm, warm_up)
 except Exception as e:
     print("Error importing ChatWithSLMNew:", e)
     raise   # show the real traceback instead of masking it
 
+# Requests run on worker threads; answers stream in as SLM_CHUNK events and
+# finish with SLM_REPLY (ELD_SLM_STREAM=0 waits for whole answers instead)
+SLM = SLMDispatcher(chat_with_slm, workers=2, max_in_flight=3,
+                    ask_stream=None if os.environ.get("ELD_SLM_STREAM") == "0" else stream_chat_with_slm)
+
 # --------------------------- Window Layout --------------------------------
 pygame.init()
 pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
 
 # --------------------------- Background Music ---------------------------
-try:
-    bg_music_path = os.path.join(os.path.dirname(__file__), "bg_loop.wav")
-    BG_LOOP = pygame.mixer.Sound(bg_music_path)
-except Exception:
-    BG_LOOP = None
+BG_LOOP = ASSETS.sound("bg_loop.wav")
 
 TOTAL_W, TOTAL_H = 1300, 700
 FPS = 60
+IDLE_FPS = 4   # redraw rate while nothing animates (input still wakes us instantly)
 
 # Left: Game (2/3), Right: Chat (1/3)
 GAME_W = TOTAL_W * 2 // 3
@@ -35,35 +57,149 @@ CHAT_W = TOTAL_W - GAME_W
 GAME_RECT = pygame.Rect(0, 0, GAME_W, TOTAL_H)
 CHAT_RECT = pygame.Rect(GAME_W, 0, CHAT_W, TOTAL_H)
 
-screen = pygame.display.set_mode((TOTAL_W, TOTAL_H))
-pygame.display.set_caption("Every Last Drop")
+# Presentation backend: "software" (scale + display.flip, the default) or
+# "texture" (scale on a pygame._sdl2 GPU Renderer, see TexturePresenter).
+# Drawing is the same Surface code either way. Pick it at launch with
+# --texture or ELD_RENDERER=texture.
+RENDER_BACKEND = "texture" if "--texture" in sys.argv[1:] else os.environ.get("ELD_RENDERER", "software")
+
+class Presenter:
+    """
+    Shows the logical frame in the (resizable) window, letterboxed:
+    - window the same size: plain blit;
+    - window an exact integer multiple: nearest-neighbour scale (fast path);
+    - anything else: smoothscale to fit.
+    The scaled frame is kept and only recomputed when the frame content or
+    the window size changed, so resizing never touches widget layout.
+    """
+
+    def __init__(self, size: Tuple[int, int], logical: Optional[pygame.Surface] = None):
+        # Everything draws into this fixed logical-resolution frame
+        self.logical = logical if logical is not None else pygame.Surface(size).convert()
+        self.dest = self.logical.get_rect()
+        self.scale = 1.0
+        self.integer_scale = True
+        self._window_size = None
+        self._scaled = None
+
+    def _fit(self, window_size: Tuple[int, int]):
+        ww, wh = window_size
+        lw, lh = self.logical.get_size()
+        self.scale = min(ww / lw, wh / lh)
+        self.integer_scale = self.scale == int(self.scale)
+        w, h = max(1, int(lw * self.scale)), max(1, int(lh * self.scale))
+        self.dest = pygame.Rect((ww - w) // 2, (wh - h) // 2, w, h)
+        self._window_size = (ww, wh)
+
+    def _layout(self, win: pygame.Surface):
+        self._fit(win.get_size())
+        self._scaled = None if self.dest.size == self.logical.get_size() else pygame.Surface(self.dest.size, 0, self.logical)
+        win.fill((0, 0, 0))  # letterbox bars
+
+    def to_logical(self, pos) -> Tuple[int, int]:
+        return (int((pos[0] - self.dest.x) / self.scale), int((pos[1] - self.dest.y) / self.scale))
+
+    def map_event(self, ev: pygame.event.Event) -> pygame.event.Event:
+        """Mouse events come in window pixels; widgets want logical ones."""
+        if ev.type not in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION):
+            return ev
+        if self.scale == 1.0 and self.dest.topleft == (0, 0):
+            return ev
+        attrs = dict(ev.dict, pos=self.to_logical(ev.pos))
+        if "rel" in attrs:
+            attrs["rel"] = (int(ev.rel[0] / self.scale), int(ev.rel[1] / self.scale))
+        return pygame.event.Event(ev.type, attrs)
+
+    def present(self, frame_changed: bool = True) -> bool:
+        """Scale + flip if anything changed; returns whether it flipped."""
+        win = pygame.display.get_surface()
+        resized = win.get_size() != self._window_size
+        if resized:
+            self._layout(win)
+        if not (frame_changed or resized):
+            return False
+        if self._scaled is None:
+            win.blit(self.logical, self.dest)
+        else:
+            if self.integer_scale:
+                pygame.transform.scale(self.logical, self.dest.size, self._scaled)
+            else:
+                pygame.transform.smoothscale(self.logical, self.dest.size, self._scaled)
+            win.blit(self._scaled, self.dest)
+        pygame.display.flip()
+        return True
+
+
+class TexturePresenter(Presenter):
+    """
+    Presenter on a pygame._sdl2 Renderer instead of display.flip().
+    Only presentation changes, not drawing:
+    - widgets still draw into the logical Surface, as with Presenter;
+    - each changed frame is uploaded whole to one streaming texture, and the
+      renderer scales it into the letterbox (on the GPU where there is one).
+    There are no per-widget textures, so the win is only the scale, and only a
+    GPU renderer makes that cheaper than Presenter's (SDL's software renderer
+    measured slower at 1920x1080). Hence `accelerated`: unless it is False,
+    creating one fails without a GPU renderer and open_display() falls back to
+    Presenter. The display module keeps a hidden 1x1 mode so convert() has a
+    pixel format.
+    """
+
+    def __init__(self, size: Tuple[int, int], logical: Optional[pygame.Surface] = None,
+                 accelerated: bool = True):
+        os.environ.setdefault("SDL_RENDER_SCALE_QUALITY", "linear")  # like smoothscale
+        self.window = sdl2_video.Window("Every Last Drop", size, resizable=True)
+        try:
+            self.renderer = sdl2_video.Renderer(self.window, accelerated=1 if accelerated else -1)
+        except Exception:
+            self.window.destroy()
+            raise
+        super().__init__(size, logical)
+        self.frame_texture = sdl2_video.Texture(self.renderer, self.logical.get_size(), streaming=True)
+
+    def present(self, frame_changed: bool = True) -> bool:
+        resized = self.window.size != self._window_size
+        if resized:
+            self._fit(self.window.size)
+        if not (frame_changed or resized):
+            return False
+        self.frame_texture.update(self.logical)
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()  # letterbox bars
+        self.renderer.blit(self.frame_texture, self.dest)
+        self.renderer.present()
+        return True
+
+def open_display(backend: str) -> Presenter:
+    """Open the game window for `backend`, falling back to software rendering."""
+    if backend == "texture":
+        if sdl2_video is None:
+            print("pygame._sdl2 is not available; using the software renderer.")
+        else:
+            try:
+                pygame.display.set_mode((1, 1), pygame.HIDDEN)
+                return TexturePresenter((TOTAL_W, TOTAL_H))
+            except Exception as e:
+                print("Texture renderer unavailable, using the software renderer:", e)
+    pygame.display.set_mode((TOTAL_W, TOTAL_H), pygame.RESIZABLE)
+    pygame.display.set_caption("Every Last Drop")
+    return Presenter((TOTAL_W, TOTAL_H))
+
+PRESENTER = open_display(RENDER_BACKEND)
+screen = PRESENTER.logical
+
+def mouse_pos() -> Tuple[int, int]:
+    """Mouse position in logical (frame) coordinates."""
+    return PRESENTER.to_logical(pygame.mouse.get_pos())
 
 # --------------------------- Fonts ----------------------------------------
 def load_fonts():
-    # Try user's absolute path first, then local, then fallback
-    candidates = [
-        "Minecraft.ttf",
-        os.path.join(os.path.dirname(__file__), "Minecraft.ttf"),
-    ]
-    font_path = None
-    for p in candidates:
-        if os.path.exists(p):
-            font_path = p
-            break
-
-    if font_path:
-        FONT = pygame.font.Font(font_path, 20)
-        TITLE = pygame.font.Font(font_path, 38)
-        BUTTON = pygame.font.Font(font_path, 18)
-        TITLE_SMALL = pygame.font.Font(font_path, 28)
-        SMALL = pygame.font.Font(font_path, 16)
-    else:
-        # Fallbacks
-        FONT = pygame.font.SysFont("georgia", 20)
-        TITLE = pygame.font.SysFont("georgia", 38, bold=True)
-        BUTTON = pygame.font.SysFont("georgia", 18, bold=True)
-        TITLE_SMALL = pygame.font.SysFont("verdana", 28, bold=True)
-        SMALL = pygame.font.SysFont("verdana", 16)
+    # Minecraft.ttf next to the game (or in the working dir), else system fallbacks
+    FONT = ASSETS.font("Minecraft.ttf", 20, "georgia")
+    TITLE = ASSETS.font("Minecraft.ttf", 38, "georgia", bold=True)
+    BUTTON = ASSETS.font("Minecraft.ttf", 18, "georgia", bold=True)
+    TITLE_SMALL = ASSETS.font("Minecraft.ttf", 28, "verdana", bold=True)
+    SMALL = ASSETS.font("Minecraft.ttf", 16, "verdana")
     return FONT, TITLE, BUTTON, TITLE_SMALL, SMALL
 
 FONT, TITLE_FONT, BUTTON_FONT, GAME_TITLE_FONT, SMALL_FONT = load_fonts()
@@ -81,124 +217,274 @@ def draw_vertical_gradient(surface: pygame.Surface, rect: pygame.Rect, color_top
         b = int(color_top[2] * (1 - t) + color_bottom[2] * t)
         pygame.draw.line(surface, (r, g, b), (rect.x, rect.y + dy), (rect.right - 1, rect.y + dy))
 
+class SurfacePool:
+    """
+    Reusable surfaces for per-frame drawing:
+    - scratch(): one surface per (tag, size, flags), cleared and handed back each frame.
+    - filled(): constant translucent fills (overlays, scrollbar), filled once.
+    - shadow(): drop shadows cached by (size, radius, alpha).
+    - text(): font renders cached by (font, text, color), for labels drawn
+      every frame; render() is the uncached one, for text that changes
+      (the chat input) and is kept by its caller.
+    Each cache holds `max_cached` entries and drops the least recently used.
+    Every real allocation goes through new(), text() or render() and bumps
+    `allocations`, so a steady-state frame can be checked to allocate
+    nothing. Surfaces made elsewhere (one-off renders, loaded images) are
+    not counted.
+    """
+
+    def __init__(self, max_cached: int = 256):
+        self.max_cached = max_cached
+        self.allocations = 0
+        self.frame_allocations = 0
+        self._frame_start = 0
+        self._scratch = OrderedDict()
+        self._filled = OrderedDict()
+        self._shadows = OrderedDict()
+        self._texts = OrderedDict()
+
+    def new(self, size, flags=pygame.SRCALPHA) -> pygame.Surface:
+        self.allocations += 1
+        return pygame.Surface(size, flags)
+
+    def _remember(self, cache: OrderedDict, key, surf: pygame.Surface) -> pygame.Surface:
+        if len(cache) >= self.max_cached:
+            cache.popitem(last=False)  # drop the least recently used entry
+        cache[key] = surf
+        return surf
+
+    @staticmethod
+    def _cached(cache: OrderedDict, key) -> Optional[pygame.Surface]:
+        surf = cache.get(key)
+        if surf is not None:
+            cache.move_to_end(key)
+        return surf
+
+    def scratch(self, tag: str, size, flags=pygame.SRCALPHA) -> pygame.Surface:
+        key = (tag, tuple(size), flags)
+        surf = self._cached(self._scratch, key)
+        if surf is None:
+            surf = self._remember(self._scratch, key, self.new(size, flags))
+        surf.fill((0, 0, 0, 0))
+        return surf
+
+    def filled(self, size, color) -> pygame.Surface:
+        key = (tuple(size), tuple(color))
+        surf = self._cached(self._filled, key)
+        if surf is None:
+            surf = self.new(size)
+            surf.fill(color)
+            self._remember(self._filled, key, surf)
+        return surf
+
+    def shadow(self, size, radius: int, alpha: int) -> pygame.Surface:
+        key = (tuple(size), radius, alpha)
+        surf = self._cached(self._shadows, key)
+        if surf is None:
+            surf = self.new(size)
+            pygame.draw.rect(surf, (0, 0, 0, alpha), surf.get_rect(), border_radius=radius)
+            self._remember(self._shadows, key, surf)
+        return surf
+
+    def text(self, font: pygame.font.Font, text: str, color) -> pygame.Surface:
+        key = (font, text, tuple(color))
+        surf = self._cached(self._texts, key)
+        if surf is None:
+            surf = self._remember(self._texts, key, self.render(font, text, color))
+        return surf
+
+    def render(self, font: pygame.font.Font, text: str, color) -> pygame.Surface:
+        self.allocations += 1
+        return font.render(text, True, color)
+
+    def begin_frame(self):
+        self._frame_start = self.allocations
+
+    def end_frame(self):
+        self.frame_allocations = self.allocations - self._frame_start
+
+SURFACE_POOL = SurfacePool()
+
 def draw_shadow_rect(surface, rect, color, radius=0, shadow_offset=(4, 4), shadow_alpha=80):
     shadow_rect = rect.move(*shadow_offset)
-    shadow_surface = pygame.Surface((shadow_rect.width, shadow_rect.height), pygame.SRCALPHA)
-    pygame.draw.rect(shadow_surface, (0, 0, 0, shadow_alpha), shadow_surface.get_rect(), border_radius=radius)
-    surface.blit(shadow_surface, shadow_rect.topleft)
+    surface.blit(SURFACE_POOL.shadow(shadow_rect.size, radius, shadow_alpha), shadow_rect.topleft)
     pygame.draw.rect(surface, color, rect, border_radius=radius)
 
-def quiz_popup(level: int, screen, FONT, BUTTON_FONT):
-    question = next(q for q in QUESTIONS_BY_MONTH if q["month"] == level)
-    answered = False
-    explanation_shown = False
-    running = True
-    result = None
+class QuizModal:
+    """
+    True/False quiz shown before a month advances. It is a modal state of
+    the main loop rather than a loop of its own: main() routes input here
+    while it is open and keeps updating/drawing the rest of the app
+    underneath. The dimmed backdrop + card is laid out once per state
+    (question, then feedback) and blitted as a single layer.
+    """
+
+    def __init__(self, level: int, size: Tuple[int, int], font: pygame.font.Font,
+                 button_font: pygame.font.Font, on_done: Callable[[], None]):
+        self.question = next(q for q in QUESTIONS_BY_MONTH if q["month"] == level)
+        self.size = size
+        self.FONT = font
+        self.BUTTON_FONT = button_font
+        self.on_done = on_done
+        self.result = None      # True/False once answered
+        self.closed = False
+
+        WIDTH, HEIGHT = size
+        popup_w, popup_h = WIDTH // 2, HEIGHT // 2  # half screen width & height
+        popup_x = (WIDTH - popup_w) // 2
+        popup_y = (HEIGHT - popup_h) // 2
+        self.popup_rect = pygame.Rect(popup_x, popup_y, popup_w, popup_h)
+
+        # --- True / False buttons ---
+        btn_w, btn_h, spacing = 140, 50, 40
+        total_w = btn_w * 2 + spacing
+        start_x = self.popup_rect.centerx - total_w // 2
+        y = self.popup_rect.bottom - 100
+        self.true_btn = pygame.Rect(start_x, y, btn_w, btn_h)
+        self.false_btn = pygame.Rect(start_x + btn_w + spacing, y, btn_w, btn_h)
+
+        # --- Exit button ---
+        self.exit_btn = pygame.Rect(self.popup_rect.centerx - 70, self.popup_rect.bottom - 80, 140, 50)
+
+        self._layer = None
+        self._layer_state = None
+
+    @property
+    def answered(self) -> bool:
+        return self.result is not None
+
+    def wrap(self, text: str) -> List[str]:
+        wrapped = []
+        line = ""
+        for w in text.split():
+            if self.FONT.size(line + w)[0] < self.popup_rect.w - 40:
+                line += w + " "
+            else:
+                wrapped.append(line); line = w + " "
+        wrapped.append(line)
+        return wrapped
 
-    WIDTH, HEIGHT = screen.get_size()
-    popup_w, popup_h = WIDTH // 2, HEIGHT // 2  # half screen width & height
-    popup_x = (WIDTH - popup_w) // 2
-    popup_y = (HEIGHT - popup_h) // 2
-    popup_rect = pygame.Rect(popup_x, popup_y, popup_w, popup_h)
+    def _draw_button(self, surf, rect, color, label):
+        pygame.draw.rect(surf, color, rect, border_radius=12)
+        pygame.draw.rect(surf, (93, 151, 209), rect, 3, border_radius=12)  # Outline
+        txt = SURFACE_POOL.text(self.BUTTON_FONT, label, (0, 0, 0))
+        surf.blit(txt, txt.get_rect(center=rect.center))
 
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if not answered:
-                    if true_btn.collidepoint(event.pos):
-                        answered, result = True, True
-                    elif false_btn.collidepoint(event.pos):
-                        answered, result = True, False
-                elif explanation_shown and exit_btn.collidepoint(event.pos):
-                    running = False
+    def _render(self) -> pygame.Surface:
+        layer = SURFACE_POOL.scratch("quiz", self.size)
+        popup_rect = self.popup_rect
 
         # --- Dim background ---
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 160))
-        screen.blit(overlay, (0, 0))
+        layer.fill((0, 0, 0, 160))
 
         # --- Popup background ---
-        pygame.draw.rect(screen, (240, 250, 255), popup_rect, border_radius=16)
-        pygame.draw.rect(screen, (60, 60, 60), popup_rect, 3, border_radius=16)
+        pygame.draw.rect(layer, (240, 250, 255), popup_rect, border_radius=16)
+        pygame.draw.rect(layer, (60, 60, 60), popup_rect, 3, border_radius=16)
 
-        if not answered:
+        if not self.answered:
             # --- Question text ---
-            wrapped = []
-            words = question["prompt"].split()
-            line = ""
-            for w in words:
-                if FONT.size(line+w)[0] < popup_rect.w-40:
-                    line += w+" "
-                else:
-                    wrapped.append(line); line = w+" "
-            wrapped.append(line)
-            for i, ln in enumerate(wrapped):
-                text = FONT.render(ln.strip(), True, (30,30,30))
-                text = FONT.render(ln.strip(), True, (30, 30, 30))
-                text_rect = text.get_rect(center=(popup_rect.centerx, popup_rect.y + 60 + i * 28))
-                screen.blit(text, text_rect)
-
-            # --- True / False buttons ---
-            btn_w, btn_h, spacing = 140, 50, 40
-            total_w = btn_w * 2 + spacing
-
-            start_x = popup_rect.centerx - total_w // 2
-            y = popup_rect.bottom - 100
-
-            true_btn = pygame.Rect(start_x, y, btn_w, btn_h)
-            false_btn = pygame.Rect(start_x + btn_w + spacing, y, btn_w, btn_h)
-
-            pygame.draw.rect(screen, (136,199,219), true_btn, border_radius=12)   # Aqua
-            pygame.draw.rect(screen, (93,151,209), true_btn, 3, border_radius=12) # Outline
-            ttxt = BUTTON_FONT.render("TRUE", True, (0,0,0))
-            screen.blit(ttxt, ttxt.get_rect(center=true_btn.center))
-
-            pygame.draw.rect(screen, (197,236,172), false_btn, border_radius=12)   # Green
-            pygame.draw.rect(screen, (93,151,209), false_btn, 3, border_radius=12) # Outline
-            ftxt = BUTTON_FONT.render("FALSE", True, (0,0,0))
-            screen.blit(ftxt, ftxt.get_rect(center=false_btn.center))
+            for i, ln in enumerate(self.wrap(self.question["prompt"])):
+                text = SURFACE_POOL.text(self.FONT, ln.strip(), (30, 30, 30))
+                layer.blit(text, text.get_rect(center=(popup_rect.centerx, popup_rect.y + 60 + i * 28)))
 
+            self._draw_button(layer, self.true_btn, (136, 199, 219), "TRUE")     # Aqua
+            self._draw_button(layer, self.false_btn, (197, 236, 172), "FALSE")   # Green
         else:
             # --- Feedback ---
-            correct = question["is_true"] == result
+            correct = self.question["is_true"] == self.result
             status = "Correct!" if correct else "Incorrect!"
-            color = (40,150,90) if correct else (215,83,79)
-            status_text = FONT.render(status, True, color)
-            status_rect = status_text.get_rect(center=(popup_rect.centerx, popup_rect.y + 40))
-            screen.blit(status_text, status_rect)
+            color = (40, 150, 90) if correct else (215, 83, 79)
+            status_text = SURFACE_POOL.text(self.FONT, status, color)
+            layer.blit(status_text, status_text.get_rect(center=(popup_rect.centerx, popup_rect.y + 40)))
 
             # --- Explanation ---
-            wrapped = []
-            words = question["explanation"].split()
-            line = ""
-            for w in words:
-                if FONT.size(line+w)[0] < popup_rect.w-40:
-                    line += w+" "
-                else:
-                    wrapped.append(line); line = w+" "
-            wrapped.append(line)
-            for i, ln in enumerate(wrapped):
-                text = FONT.render(ln.strip(), True, (30, 30, 30))
-                text_rect = text.get_rect(center=(popup_rect.centerx, popup_rect.y + 80 + i * 28))
-                screen.blit(text, text_rect)
-
-            # --- Exit button ---
-            exit_btn = pygame.Rect(popup_rect.centerx-70, popup_rect.bottom-80, 140, 50)
-            pygame.draw.rect(screen, (221,223,128), exit_btn, border_radius=12)   # Yellow
-            pygame.draw.rect(screen, (93,151,209), exit_btn, 3, border_radius=12) # Outline
-            etxt = BUTTON_FONT.render("CONTINUE", True, (0,0,0))
-            screen.blit(etxt, etxt.get_rect(center=exit_btn.center))
-            explanation_shown = True
+            for i, ln in enumerate(self.wrap(self.question["explanation"])):
+                text = SURFACE_POOL.text(self.FONT, ln.strip(), (30, 30, 30))
+                layer.blit(text, text.get_rect(center=(popup_rect.centerx, popup_rect.y + 80 + i * 28)))
 
-        pygame.display.flip()
-    return True
+            self._draw_button(layer, self.exit_btn, (221, 223, 128), "CONTINUE")  # Yellow
+        return layer
+
+    def handle_event(self, ev: pygame.event.Event):
+        if self.closed or ev.type != pygame.MOUSEBUTTONDOWN or ev.button != 1:
+            return
+        if not self.answered:
+            if self.true_btn.collidepoint(ev.pos):
+                self.result = True
+            elif self.false_btn.collidepoint(ev.pos):
+                self.result = False
+        elif self.exit_btn.collidepoint(ev.pos):
+            self.closed = True
+            self.on_done()
+
+    def draw(self, surface: pygame.Surface):
+        if self.closed:
+            return
+        if self._layer_state != self.answered:
+            self._layer = self._render()
+            self._layer_state = self.answered
+        surface.blit(self._layer, (0, 0))
 
 
 # ======================================================================
 #                               CHAT UI
 # ======================================================================
+def wrap_with_offsets(text: str, font: pygame.font.Font, max_width: int) -> List[Tuple[str, int]]:
+    """ChatUI's word wrap, also giving the index in `text` where each line starts."""
+    lines = []
+    para_start = 0
+    paragraphs = text.split("\n")
+    for idx, para in enumerate(paragraphs):
+        current = ""
+        line_start = pos = para_start
+        for w in para.split(" "):
+            test = current + w + " "
+            if font.size(test)[0] <= max_width:
+                current = test
+            else:
+                if current:
+                    lines.append((current.strip(), line_start))
+                current = w + " "
+                line_start = pos
+            pos += len(w) + 1
+        if current:
+            lines.append((current.strip(), line_start))
+        if idx < len(paragraphs) - 1:
+            lines.append(("<PARA_BREAK>", para_start + len(para)))
+        para_start += len(para) + 1
+    return lines
+
+
+class BubbleLayout:
+    """
+    Wrapped and rendered lines of one chat bubble, kept between frames.
+    When the text only grew at the end (a streamed answer) just the last
+    line is wrapped and rendered again: greedy wrapping never changes a
+    line once a later one has started.
+    """
+
+    def __init__(self, speaker: str, font: pygame.font.Font, max_width: int, color):
+        self.speaker = speaker
+        self.font = font
+        self.max_width = max_width
+        self.color = color
+        self.text = None
+        self.lines: List[Tuple[str, int]] = []   # (line, start index in text)
+        self.surfaces: List[Optional[pygame.Surface]] = []  # None for paragraph breaks
+        self.height = 0
+
+    def set_text(self, text: str):
+        if text == self.text:
+            return
+        keep = len(self.lines) - 1 if self.text and text.startswith(self.text) else 0
+        start = self.lines[keep][1] if keep else 0
+        fresh = [(ln, start + off) for ln, off in wrap_with_offsets(text[start:], self.font, self.max_width)]
+        self.lines[keep:] = fresh
+        self.surfaces[keep:] = [None if ln == "<PARA_BREAK>" else self.font.render(ln, True, self.color)
+                                for ln, _ in fresh]
+        self.text = text
+        self.height = sum(10 if ln == "<PARA_BREAK>" else 28 for ln, _ in self.lines) + 24
+
 class ChatUI:
     # Color scheme (cute palette)
     COLOR_AQUA   = (136, 199, 219)   # #88c7db
@@ -226,6 +512,9 @@ class ChatUI:
     ARROW_BG = COLOR_BLUE
     ARROW_HOVER = (60, 110, 180)
 
+    THINKING_TEXT = "Thinking"
+    THINKING_INTERVAL = 400  # ms per dot
+
     def __init__(self, rect: pygame.Rect, fonts: Tuple[pygame.font.Font, pygame.font.Font, pygame.font.Font]):
         self.rect = rect.copy()
         self.W, self.H = rect.w, rect.h
@@ -241,6 +530,7 @@ class ChatUI:
 
         # State
         self.input_text = ""
+        self._input_line = (None, None)   # (text, its render) for the input box
         self.chat_history: List[Tuple[str, str]] = []
         self.max_history = 100
 
@@ -288,15 +578,17 @@ class ChatUI:
         self.right_arrow_rect = None
         self.ask_button_rect = None
         self.scrollbar_rect = None
-        self.predefined_button_rects: List[pygame.Rect] = []
+        self.button_row_view = None  # built on first draw
 
         # Sounds
-        self.pop_sound = None
-        try:
-            sound_path = os.path.join(os.path.dirname(__file__), "pop.wav")
-            self.pop_sound = pygame.mixer.Sound(sound_path)
-        except Exception:
-            self.pop_sound = None
+        self.pop_sound = ASSETS.sound("pop.wav")
+
+        # Outstanding AquaGuide requests: request id -> index of its "thinking" bubble
+        self.pending_replies = {}
+        self.streaming = set()  # request ids whose answer has started arriving
+        self._bubbles = {}      # chat_history index -> BubbleLayout
+        self.thinking_timer = 0
+        self.thinking_dots = 1
 
         # Greeting
         self.chat_history.append(("AquaGuide",
@@ -307,121 +599,140 @@ class ChatUI:
     # ---------- Helpers ----------
     def wrap_text(self, text: str, font: pygame.font.Font, max_width: int) -> List[str]:
         """Wrap text into lines that fit max_width. Preserves paragraph gaps."""
-        lines = []
-        paragraphs = text.split("\n")
-        for idx, para in enumerate(paragraphs):
-            words = para.split(" ")
-            current = ""
-            for w in words:
-                test = current + w + " "
-                if font.size(test)[0] <= max_width:
-                    current = test
-                else:
-                    if current:
-                        lines.append(current.strip())
-                    current = w + " "
-            if current:
-                lines.append(current.strip())
-            if idx < len(paragraphs) - 1:
-                lines.append("<PARA_BREAK>")
-        return lines
+        return [ln for ln, _ in wrap_with_offsets(text, font, max_width)]
+
+    def visible_history(self) -> range:
+        """chat_history indices that are shown (the last max_history messages)."""
+        return range(max(0, len(self.chat_history) - self.max_history), len(self.chat_history))
+
+    def bubble(self, idx: int) -> BubbleLayout:
+        """Layout of chat_history[idx], brought up to date with its text."""
+        speaker, msg = self.chat_history[idx]
+        layout = self._bubbles.get(idx)
+        if layout is None or layout.speaker != speaker:
+            color = self.TEXT_COLOR if speaker == "You" else self.AQUA_TEXT
+            layout = self._bubbles[idx] = BubbleLayout(speaker, self.FONT, self.bubble_max_w, color)
+        layout.set_text(msg)
+        return layout
 
     def calc_total_height(self) -> int:
-        y = 0
-        for speaker, msg in self.chat_history[-self.max_history:]:
-            lines = self.wrap_text(msg, self.FONT, self.bubble_max_w)
-            bubble_h = 0
-            for ln in lines:
-                if ln == "<PARA_BREAK>":
-                    bubble_h += 10
-                else:
-                    bubble_h += 28
-            bubble_h += 24
-            y += bubble_h + 20
-        return y
+        return sum(self.bubble(i).height + 20 for i in self.visible_history())
 
     # ---------- Drawing ----------
-    def draw_predefined_buttons(self, surf: pygame.Surface):
-        self.predefined_button_rects = []
-
+    def _build_button_row(self):
+        """
+        Lay out the prompt row once: arrow and scroll-area rects, each button's
+        rect on the row, the row pre-rendered in its normal colors, and one
+        hover tile per button (button + shadow in the hover color).
+        """
         button_y = self.H - 100
         arrow_w = 30
         margin = 10
 
-        left_arrow = pygame.Rect(self.rect.x + margin, self.rect.y + button_y,
-                                 arrow_w, self.button_height)
-        right_arrow = pygame.Rect(self.rect.x + self.W - margin - arrow_w,
-                                  self.rect.y + button_y,
-                                  arrow_w, self.button_height)
-        self.left_arrow_rect = left_arrow
-        self.right_arrow_rect = right_arrow
+        self.left_arrow_rect = pygame.Rect(self.rect.x + margin, self.rect.y + button_y,
+                                           arrow_w, self.button_height)
+        self.right_arrow_rect = pygame.Rect(self.rect.x + self.W - margin - arrow_w,
+                                            self.rect.y + button_y,
+                                            arrow_w, self.button_height)
 
-        scroll_area_x = left_arrow.right + margin
-        scroll_area_w = max(0, right_arrow.left - margin - scroll_area_x)
-        scroll_area = pygame.Rect(scroll_area_x, self.rect.y + button_y,
-                                  scroll_area_w, self.button_height)
+        scroll_area_x = self.left_arrow_rect.right + margin
+        scroll_area_w = max(0, self.right_arrow_rect.left - margin - scroll_area_x)
+        self.button_scroll_area = pygame.Rect(scroll_area_x, self.rect.y + button_y,
+                                              scroll_area_w, self.button_height)
 
         # Measure all buttons
-        metrics = []
-        total_w = 0
+        labels = []
+        self.button_row_rects: List[pygame.Rect] = []
+        xoff = 0
         for label, prompt in self.predefined_buttons:
             text_surface = self.BUTTON_FONT.render(label, True, (30, 30, 30))
             w = text_surface.get_width() + 30
-            metrics.append((label, w, text_surface))
-            total_w += w + self.button_spacing
-        if total_w > 0:
-            total_w -= self.button_spacing
+            labels.append(text_surface)
+            self.button_row_rects.append(pygame.Rect(xoff, 0, w, self.button_height))
+            xoff += w + self.button_spacing
+        total_w = max(xoff - self.button_spacing, 1)
+        self.button_row_max_offset = max(0, total_w - scroll_area_w)
+
+        def render_row(color):
+            row = SURFACE_POOL.new((total_w, self.button_height))
+            for rect_on_row, text_surface in zip(self.button_row_rects, labels):
+                draw_shadow_rect(row, rect_on_row, color, radius=8, shadow_offset=(2, 2), shadow_alpha=80)
+                row.blit(
+                    text_surface,
+                    (rect_on_row.centerx - text_surface.get_width() // 2,
+                     rect_on_row.centery - text_surface.get_height() // 2)
+                )
+            return row
+
+        self.button_row_normal = render_row(self.BUTTON_COLOR)
+        hover_row = render_row(self.BUTTON_HOVER)
+        row_bounds = hover_row.get_rect()
+        self.button_hover_tiles = []
+        for rect_on_row in self.button_row_rects:
+            tile_rect = rect_on_row.inflate(2, 0).move(1, 0).clip(row_bounds)  # + shadow
+            self.button_hover_tiles.append((tile_rect, hover_row.subsurface(tile_rect).copy()))
+
+        self.button_row_view = SURFACE_POOL.new((total_w, self.button_height))
+        self.button_row_hovered = -1  # force the first compose
+
+    def _button_row_surface(self, hovered: Optional[int]) -> pygame.Surface:
+        """Row with at most one hover tile swapped in; recomposed only when hover changes."""
+        if hovered != self.button_row_hovered:
+            view = self.button_row_view
+            # Copy pixels verbatim (clear + additive blit) so shadows don't double up
+            view.fill((0, 0, 0, 0))
+            view.blit(self.button_row_normal, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            if hovered is not None:
+                tile_rect, tile = self.button_hover_tiles[hovered]
+                view.fill((0, 0, 0, 0), tile_rect)
+                view.blit(tile, tile_rect.topleft, special_flags=pygame.BLEND_RGBA_ADD)
+            self.button_row_hovered = hovered
+        return self.button_row_view
+
+    def button_at(self, pos, ignore_arrows: bool = False) -> Optional[int]:
+        """Index of the (at least partly visible) prompt button under pos."""
+        if self.button_row_view is None:
+            return None
+        if not ignore_arrows and (self.left_arrow_rect.collidepoint(pos) or
+                                  self.right_arrow_rect.collidepoint(pos)):
+            return None
+        dx = self.button_scroll_area.x - self.button_scroll_offset
+        for i, rect_on_row in enumerate(self.button_row_rects):
+            btn_rect_screen = rect_on_row.move(dx, self.button_scroll_area.y)
+            if btn_rect_screen.colliderect(self.button_scroll_area) and btn_rect_screen.collidepoint(pos):
+                return i
+        return None
 
-        max_offset = max(0, total_w - scroll_area_w)
-        self.button_scroll_offset = clamp(self.button_scroll_offset, 0, max_offset)
+    def draw_predefined_buttons(self, surf: pygame.Surface):
+        if self.button_row_view is None:
+            self._build_button_row()
+        self.button_scroll_offset = clamp(self.button_scroll_offset, 0, self.button_row_max_offset)
 
-        row_surface = pygame.Surface((max(total_w, 1), self.button_height), pygame.SRCALPHA)
-        xoff = 0
-        mouse = pygame.mouse.get_pos()
-        over_arrows = (left_arrow.collidepoint(mouse) or right_arrow.collidepoint(mouse))
-
-        # Draw each button
-        for (label, w, text_surface), (btn_label, prompt) in zip(metrics, self.predefined_buttons):
-            rect_on_row = pygame.Rect(xoff, 0, w, self.button_height)
-            btn_rect_screen = pygame.Rect(
-                scroll_area_x + rect_on_row.x - self.button_scroll_offset,
-                self.rect.y + button_y,
-                rect_on_row.width, rect_on_row.height
-            )
-            visible = btn_rect_screen.colliderect(scroll_area)
-            self.predefined_button_rects.append(btn_rect_screen if visible else pygame.Rect(0, 0, 0, 0))
-
-            hovered = (visible and not over_arrows and btn_rect_screen.collidepoint(mouse))
-            color = self.BUTTON_HOVER if hovered else self.BUTTON_COLOR
-
-            draw_shadow_rect(row_surface, rect_on_row, color, radius=8, shadow_offset=(2, 2), shadow_alpha=80)
-            row_surface.blit(
-                text_surface,
-                (rect_on_row.centerx - text_surface.get_width() // 2,
-                 rect_on_row.centery - text_surface.get_height() // 2)
-            )
-            xoff += w + self.button_spacing
+        mouse = mouse_pos()
+        left_arrow, right_arrow = self.left_arrow_rect, self.right_arrow_rect
+        row = self._button_row_surface(self.button_at(mouse))
 
         # Clip and blit row
-        prev_clip = screen.get_clip()
-        screen.set_clip(scroll_area)
-        screen.blit(row_surface, (scroll_area_x - self.button_scroll_offset, self.rect.y + button_y))
-        screen.set_clip(prev_clip)
+        scroll_area = self.button_scroll_area
+        prev_clip = surf.get_clip()
+        surf.set_clip(scroll_area)
+        surf.blit(row, (scroll_area.x - self.button_scroll_offset, scroll_area.y))
+        surf.set_clip(prev_clip)
 
         # Arrows
         la_color = self.ARROW_HOVER if left_arrow.collidepoint(mouse) else self.ARROW_BG
         ra_color = self.ARROW_HOVER if right_arrow.collidepoint(mouse) else self.ARROW_BG
-        draw_shadow_rect(screen, left_arrow, la_color, radius=6, shadow_offset=(2, 2), shadow_alpha=80)
-        draw_shadow_rect(screen, right_arrow, ra_color, radius=6, shadow_offset=(2, 2), shadow_alpha=80)
+        draw_shadow_rect(surf, left_arrow, la_color, radius=6, shadow_offset=(2, 2), shadow_alpha=80)
+        draw_shadow_rect(surf, right_arrow, ra_color, radius=6, shadow_offset=(2, 2), shadow_alpha=80)
 
         pygame.draw.polygon(
-            screen, (255, 255, 255),
+            surf, (255, 255, 255),
             [(left_arrow.centerx + 6, left_arrow.centery - 8),
              (left_arrow.centerx - 6, left_arrow.centery),
              (left_arrow.centerx + 6, left_arrow.centery + 8)]
         )
         pygame.draw.polygon(
-            screen, (255, 255, 255),
+            surf, (255, 255, 255),
             [(right_arrow.centerx - 6, right_arrow.centery - 8),
              (right_arrow.centerx + 6, right_arrow.centery),
              (right_arrow.centerx - 6, right_arrow.centery + 8)]
@@ -437,10 +748,9 @@ class ChatUI:
         bar_y = self.rect.y + self.CHAT_AREA_TOP + int((self.CHAT_AREA_HEIGHT - bar_h) * scroll_ratio)
         r = pygame.Rect(self.rect.x + self.W - 12, bar_y, 8, bar_h)
 
-        # Draw with alpha
-        s = pygame.Surface((r.w, r.h), pygame.SRCALPHA)
-        s.fill(self.SCROLLBAR_COLOR)
-        screen.blit(s, r.topleft)
+        # Draw with alpha: one full-height thumb, shown at the current height
+        thumb = SURFACE_POOL.filled((r.w, self.CHAT_AREA_HEIGHT), self.SCROLLBAR_COLOR)
+        screen.blit(thumb, r.topleft, pygame.Rect(0, 0, r.w, r.h))
         self.scrollbar_rect = r
 
     def draw(self, surface: pygame.Surface):
@@ -450,18 +760,20 @@ class ChatUI:
         # Title bar
         title_rect = pygame.Rect(self.rect.x, self.rect.y, self.W, 70)
         draw_shadow_rect(surface, title_rect, self.TITLE_BAR, radius=0, shadow_offset=(0, 3), shadow_alpha=100)
-        title_surface = self.TITLE_FONT.render("AquaGuide", True, (255, 255, 255))
+        title_surface = SURFACE_POOL.text(self.TITLE_FONT, "AquaGuide", (255, 255, 255))
         surface.blit(title_surface, (self.rect.x + self.W // 2 - title_surface.get_width() // 2, self.rect.y + 18))
 
         # Chat scrollable area
-        chat_area_surface = pygame.Surface((self.W, self.CHAT_AREA_HEIGHT), pygame.SRCALPHA)
+        chat_area_surface = SURFACE_POOL.scratch("chat_area", (self.W, self.CHAT_AREA_HEIGHT))
         yoff = -self.scroll_offset
-        for speaker, msg in self.chat_history[-self.max_history:]:
-            lines = self.wrap_text(msg, self.FONT, self.bubble_max_w)
-            bubble_h = 0
-            for ln in lines:
-                bubble_h += 10 if ln == "<PARA_BREAK>" else 28
-            bubble_h += 24
+        shown = self.visible_history()
+        for idx in shown:
+            speaker = self.chat_history[idx][0]
+            layout = self.bubble(idx)
+            bubble_h = layout.height
+            if yoff + bubble_h + 3 < 0 or yoff > self.CHAT_AREA_HEIGHT:  # off screen (3px shadow)
+                yoff += bubble_h + 20
+                continue
 
             if speaker == "You":
                 bubble_rect = pygame.Rect(self.W - (self.bubble_max_w + 40), yoff, self.bubble_max_w + 20, bubble_h)
@@ -476,11 +788,10 @@ class ChatUI:
 
             draw_shadow_rect(chat_area_surface, bubble_rect, color, radius=16, shadow_offset=(3, 3), shadow_alpha=70)
             line_y = yoff + 14
-            for ln in lines:
-                if ln == "<PARA_BREAK>":
+            for ts in layout.surfaces:
+                if ts is None:  # paragraph break
                     line_y += 10
                     continue
-                ts = self.FONT.render(ln, True, text_color)
                 if align_left:
                     chat_area_surface.blit(ts, (bubble_rect.x + 18, line_y))
                 else:
@@ -488,6 +799,10 @@ class ChatUI:
                 line_y += 28
             yoff += bubble_h + 20
 
+        if len(self._bubbles) > len(shown):
+            for idx in [i for i in self._bubbles if i not in shown]:
+                del self._bubbles[idx]
+
         surface.blit(chat_area_surface, (self.rect.x, self.rect.y + self.CHAT_AREA_TOP))
 
         # Scrollbar
@@ -505,47 +820,65 @@ class ChatUI:
         input_rect = pygame.Rect(self.rect.x + 20, self.rect.y + self.H - 50, self.W - 150, 42)
         draw_shadow_rect(surface, input_rect, self.INPUT_BG, radius=12, shadow_offset=(2, 2), shadow_alpha=90)
 
-        # Render full text
-        ts_full = self.FONT.render(self.input_text, True, self.CURSOR_COLOR)
+        # Render full text (again only when it changed: every prefix typed would crowd the text cache)
+        if self._input_line[0] != self.input_text:
+            self._input_line = (self.input_text, SURFACE_POOL.render(self.FONT, self.input_text, self.CURSOR_COLOR))
+        ts_full = self._input_line[1]
 
-        # Clip if too wide for the box
+        # Clip to the box's width, keeping the end of the text
         max_width = input_rect.w - 20
-        if ts_full.get_width() > max_width:
-            text_surface = ts_full.subsurface(
-                (ts_full.get_width() - max_width, 0, max_width, ts_full.get_height())
-            )
-        else:
-            text_surface = ts_full
+        shown = pygame.Rect(0, 0, min(ts_full.get_width(), max_width), ts_full.get_height())
+        shown.right = ts_full.get_width()
 
         # Blit clipped or full text
-        surface.blit(text_surface, (input_rect.x + 14, input_rect.y + 12))
+        surface.blit(ts_full, (input_rect.x + 14, input_rect.y + 12), shown)
 
         # Cursor (always at end of visible text)
         if self.cursor_visible:
-            cx = input_rect.x + 14 + text_surface.get_width() + 2
+            cx = input_rect.x + 14 + shown.w + 2
             cy = input_rect.y + 12
-            ch = text_surface.get_height()
+            ch = shown.h
             pygame.draw.line(surface, self.CURSOR_COLOR, (cx, cy), (cx, cy + ch), 2)
 
         # Ask button
         self.ask_button_rect = pygame.Rect(self.rect.x + self.W - 120, self.rect.y + self.H - 50, 100, 42)
-        mouse = pygame.mouse.get_pos()
+        mouse = mouse_pos()
         bcolor = self.BUTTON_HOVER if self.ask_button_rect.collidepoint(mouse) else self.BUTTON_COLOR
         draw_shadow_rect(surface, self.ask_button_rect, bcolor, radius=8, shadow_offset=(2, 2), shadow_alpha=80)
-        btxt = self.BUTTON_FONT.render("Ask", True, (0, 0, 0))
+        btxt = SURFACE_POOL.text(self.BUTTON_FONT, "Ask", (0, 0, 0))
         surface.blit(btxt, (self.ask_button_rect.centerx - btxt.get_width() // 2,
                             self.ask_button_rect.centery - btxt.get_height() // 2))
 
     # ---------- Events / Update ----------
+    def is_animating(self) -> bool:
+        """True while something moves without input (scroll inertia, scrollbar drag, thinking dots)."""
+        return abs(self.scroll_velocity) > 0.05 or self.dragging_scrollbar or bool(self.pending_replies)
+
+    def ms_until_redraw(self) -> int:
+        """Time until the cursor blinks next."""
+        return max(0, self.cursor_interval - self.cursor_timer)
+
     def update(self, dt_ms: int):
         self.cursor_timer += dt_ms
         if self.cursor_timer >= self.cursor_interval:
             self.cursor_visible = not self.cursor_visible
             self.cursor_timer = 0
 
+        # Thinking bubbles cycle "." / ".." / "..."
+        if self.pending_replies:
+            self.thinking_timer += dt_ms
+            if self.thinking_timer >= self.THINKING_INTERVAL:
+                self.thinking_timer = 0
+                self.thinking_dots = self.thinking_dots % 3 + 1
+                for request_id, idx in self.pending_replies.items():
+                    if request_id not in self.streaming:
+                        self.chat_history[idx] = ("AquaGuide", self.THINKING_TEXT + "." * self.thinking_dots)
+
         # Inertia
         self.scroll_offset += self.scroll_velocity * dt_ms / 16.0
         self.scroll_velocity *= self.scroll_damping
+        if abs(self.scroll_velocity) <= 0.05:
+            self.scroll_velocity = 0.0
         total_h = self.calc_total_height()
         max_scroll = max(0, total_h - self.CHAT_AREA_HEIGHT)
         if self.scroll_offset < 0:
@@ -556,6 +889,12 @@ class ChatUI:
             self.scroll_velocity = 0
 
     def handle_event(self, ev: pygame.event.Event):
+        if ev.type == SLM_CHUNK:
+            self.receive_chunk(ev)  # answers still land after game over
+            return
+        if ev.type == SLM_REPLY:
+            self.receive_reply(ev)
+            return
         if self.disabled:
             return
         # Keyboard always active for chat input (assuming the game isn't over/won)
@@ -571,7 +910,7 @@ class ChatUI:
 
         # Mouse events only if inside our rect
         if ev.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.MOUSEWHEEL):
-            mx, my = pygame.mouse.get_pos()
+            mx, my = mouse_pos()
             inside = self.rect.collidepoint(mx, my)
 
             if ev.type == pygame.MOUSEWHEEL:
@@ -613,15 +952,16 @@ class ChatUI:
                     return
 
                 # Predefined buttons → send prompt to SLM
-                for rect, (label, prompt) in zip(self.predefined_button_rects, self.predefined_buttons):
-                    if rect.width > 0 and rect.collidepoint(ev.pos):
-                        self.submit_question(prompt)
-                        if self.pop_sound:
-                            try:
-                                self.pop_sound.play()
-                            except Exception:
-                                pass
-                        return
+                idx = self.button_at(ev.pos, ignore_arrows=True)
+                if idx is not None:
+                    label, prompt = self.predefined_buttons[idx]
+                    self.submit_question(prompt)
+                    if self.pop_sound:
+                        try:
+                            self.pop_sound.play()
+                        except Exception:
+                            pass
+                    return
 
 
             elif ev.type == pygame.MOUSEBUTTONUP and ev.button == 1:
@@ -638,32 +978,67 @@ class ChatUI:
                     self.scroll_offset = clamp(self.scroll_offset, 0, max_scroll)
 
     def submit_question(self, prompt: str = None):
+        """Post the question and a "thinking" bubble; the answer arrives later as an SLM_REPLY."""
         text = prompt if prompt else self.input_text.strip()
         if not text:
             return
-        self.chat_history.append(("You", text))
 
+        # Prefetched (or asked before): answer right away, no round trip
+        answer = cached_answer(text)
+        request_id = SLM.submit(text) if answer is None else None
+        if answer is None and request_id is None:
+            # Keep what they typed so it can be sent once an answer comes back
+            self.chat_history.append(("AquaGuide", "Hang on, I'm still answering your other questions!"))
+            self.scroll_to_bottom()
+            return
+
+        self.chat_history.append(("You", text))
         if self.pop_sound:
             try:
                 self.pop_sound.play()
             except Exception:
                 pass
 
-        try:
-            resp = chat_with_slm(text)
-        except Exception as e:
-            resp = f"[Error contacting SLM: {e}]"
+        if answer is not None:
+            self.chat_history.append(("AquaGuide", answer))
+            remember_turn(text, answer)
+        else:
+            self.pending_replies[request_id] = len(self.chat_history)
+            self.chat_history.append(("AquaGuide", self.THINKING_TEXT + "." * self.thinking_dots))
+        if not prompt:
+            self.input_text = ""
+        self.scroll_to_bottom()
+
+    def receive_chunk(self, ev: pygame.event.Event):
+        """Append a streamed piece of the answer to its bubble (replacing "Thinking...")."""
+        idx = self.pending_replies.get(ev.request_id)
+        if idx is None:
+            return
+        at_bottom = self.scroll_offset >= self.calc_total_height() - self.CHAT_AREA_HEIGHT - 1
+        if ev.request_id in self.streaming:
+            self.chat_history[idx] = ("AquaGuide", self.chat_history[idx][1] + ev.text)
+        else:
+            self.streaming.add(ev.request_id)
+            self.chat_history[idx] = ("AquaGuide", ev.text)
+        if at_bottom:
+            self.scroll_to_bottom()
+
+    def receive_reply(self, ev: pygame.event.Event):
+        """Swap the request's bubble for the final answer."""
+        idx = self.pending_replies.pop(ev.request_id, None)
+        self.streaming.discard(ev.request_id)
+        if idx is None:
+            return
+        self.chat_history[idx] = ("AquaGuide", ev.text)
 
         if self.pop_sound:
             try:
                 self.pop_sound.play()
             except Exception:
                 pass
+        self.scroll_to_bottom()
 
-        self.chat_history.append(("AquaGuide", resp))
-        if not prompt:
-            self.input_text = ""
-
+    def scroll_to_bottom(self):
         total_h = self.calc_total_height()
         if total_h > self.CHAT_AREA_HEIGHT:
             self.scroll_offset = total_h - self.CHAT_AREA_HEIGHT
@@ -789,6 +1164,10 @@ QUESTIONS_BY_MONTH = [
     },
 ]
 
+# AquaGuide answers from these too when the model can't be reached
+OFFLINE.add_passages(q["explanation"] for q in QUESTIONS_BY_MONTH)
+OFFLINE.add_passages(f"{g.name} grass: {g.note}" for g in GRASS_TYPES)
+
 
 @dataclass
 class Lawn:
@@ -826,7 +1205,7 @@ class Button:
     def draw(self, surf: pygame.Surface, font: pygame.font.Font):
         pygame.draw.rect(surf, BUTTON_BG, self.rect, border_radius=12)
         pygame.draw.rect(surf, BUTTON_BORDER, self.rect, width=2, border_radius=12)
-        label = font.render(self.text, True, BLACK)
+        label = SURFACE_POOL.text(font, self.text, BLACK)
         surf.blit(label, label.get_rect(center=self.rect.center))
 
     def handle_event(self, ev: pygame.event.Event):
@@ -847,10 +1226,10 @@ class ArrowToggle:
     def draw(self, surf: pygame.Surface, font: pygame.font.Font, small: pygame.font.Font):
         pygame.draw.rect(surf, PANEL_BG, self.rect, border_radius=10)
         pygame.draw.rect(surf, PANEL_BORDER, self.rect, width=2, border_radius=10)
-        label_surf = font.render(self.label, True, WHITE)
+        label_surf = SURFACE_POOL.text(font, self.label, WHITE)
         surf.blit(label_surf, (self.rect.x + 12, self.rect.y + 6))
         idx = self.get_index()
-        opt_surf = font.render(self.options[idx], True, WHITE)
+        opt_surf = SURFACE_POOL.text(font, self.options[idx], WHITE)
         surf.blit(opt_surf, (self.rect.centerx - opt_surf.get_width() // 2, self.rect.centery - 8))
         pygame.draw.polygon(surf, WHITE, [
             (self.left_rect.right, self.left_rect.top),
@@ -870,6 +1249,42 @@ class ArrowToggle:
             elif self.right_rect.collidepoint(ev.pos):
                 self.set_index((self.get_index() + 1) % len(self.options))
 
+# Pre-rendered slider pieces, keyed by (w, h, color) so sliders of the same
+# size share one track and one fully-filled striped bar.
+_SLIDER_PIECES = {}
+
+def _build_slider_pieces(w: int, h: int, color: Tuple[int, int, int]):
+    key = (w, h, color)
+    pieces = _SLIDER_PIECES.get(key)
+    if pieces:
+        return pieces
+
+    # Rounded capsule mask (keeps rounded corners)
+    mask = SURFACE_POOL.new((w, h))
+    pygame.draw.rect(mask, (255, 255, 255, 255), mask.get_rect(), border_radius=8)
+
+    # Track background (dark capsule)
+    track = SURFACE_POOL.new((w, h))
+    pygame.draw.rect(track, (60, 60, 60), track.get_rect(), border_radius=8)
+    track.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+
+    # Solid fill + diagonal stripes across the whole bar; draw() only ever
+    # copies the left fill_w columns of this.
+    fill = SURFACE_POOL.new((w, h))
+    fill.fill(color)
+    stripe_gap = 10  # spacing between stripes
+    stripe_thickness = 2  # line thickness
+    stripe_color = (255, 255, 255, 55)
+
+    # "\" direction: top-left to bottom-right
+    for x in range(-h, w + h, stripe_gap):
+        pygame.draw.line(fill, stripe_color, (x, h), (x + h, 0), stripe_thickness)
+    fill.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+
+    pieces = (track, fill)
+    _SLIDER_PIECES[key] = pieces
+    return pieces
+
 class SliderBar:
     def __init__(self, rect: pygame.Rect, label: str, color: Tuple[int, int, int]):
         self.rect = rect
@@ -877,61 +1292,66 @@ class SliderBar:
         self.color = color
         self.value = 0.0
 
+        # Memoized render of the last fill width / value text
+        self._bar_surf = None
+        self._bar_key = None
+        self._label_surf = None
+        self._label_font = None
+        self._val_surf = None
+        self._val_key = None
+
     def set_value(self, v: float):
         self.value = clamp(v, 0.0, 100.0)
 
-    def draw(self, surf: pygame.Surface, font: pygame.font.Font, small: pygame.font.Font):
-        # Label
-        label = font.render(self.label, True, WHITE)
-        surf.blit(label, (self.rect.x, self.rect.y - 26))
-
+    def _bar(self) -> pygame.Surface:
         w, h = self.rect.w, self.rect.h
-        bar_surf = pygame.Surface((w, h), pygame.SRCALPHA)
-
-        # Track background (dark capsule)
-        pygame.draw.rect(bar_surf, (60, 60, 60), bar_surf.get_rect(), border_radius=8)
-
-        # Filled region width
         fill_w = int(w * (self.value / 100.0))
-
+        key = (w, h, self.color, fill_w)
+        if key == self._bar_key:
+            return self._bar_surf
+
+        track, fill = _build_slider_pieces(w, h, self.color)
+        if self._bar_surf is None or self._bar_surf.get_size() != (w, h):
+            self._bar_surf = SURFACE_POOL.new((w, h))
+        bar_surf = self._bar_surf
+
+        # Copy pixels verbatim (clear + additive blit): the stripes are
+        # translucent, so a normal alpha blit would blend them into the track
+        bar_surf.fill((0, 0, 0, 0))
+        bar_surf.blit(track, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
         if fill_w > 0:
-            # Solid fill
-            fill_rect = pygame.Rect(0, 0, fill_w, h)
-            pygame.draw.rect(bar_surf, self.color, fill_rect)
-
-            # --- Diagonal stripes ONLY inside the filled region ---
-            prev_clip = bar_surf.get_clip()
-            bar_surf.set_clip(pygame.Rect(0, 0, fill_w, h))  # clip to filled area
-
-            stripe_gap = 10  # spacing between stripes
-            stripe_thickness = 2  # line thickness
-            stripe_color = (255, 255, 255, 55)
+            area = pygame.Rect(0, 0, fill_w, h)
+            bar_surf.fill((0, 0, 0, 0), area)
+            bar_surf.blit(fill, (0, 0), area, special_flags=pygame.BLEND_RGBA_ADD)
 
-            # "\" direction: top-left to bottom-right
-            for x in range(-h, fill_w + h, stripe_gap):
-                start = (x, h)
-                end = (x + h, 0)
-                pygame.draw.line(bar_surf, stripe_color, start, end, stripe_thickness)
+        self._bar_key = key
+        return bar_surf
 
-            bar_surf.set_clip(prev_clip)
-
-        # Clip everything to the rounded capsule shape (keeps rounded corners)
-        mask = pygame.Surface((w, h), pygame.SRCALPHA)
-        pygame.draw.rect(mask, (255, 255, 255, 255), mask.get_rect(), border_radius=8)
-        bar_surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    def draw(self, surf: pygame.Surface, font: pygame.font.Font, small: pygame.font.Font):
+        # Label
+        if self._label_font is not font:
+            self._label_surf = font.render(self.label, True, WHITE)
+            self._label_font = font
+        surf.blit(self._label_surf, (self.rect.x, self.rect.y - 26))
 
         # Blit bar and draw outline
-        surf.blit(bar_surf, (self.rect.x, self.rect.y))
+        surf.blit(self._bar(), (self.rect.x, self.rect.y))
         pygame.draw.rect(surf, WHITE, self.rect, width=2, border_radius=8)
 
         # Value text
-        val_txt = small.render(f"{int(self.value)}", True, WHITE)
-        surf.blit(val_txt, (self.rect.right - 32, self.rect.y + 2))
+        val_key = (int(self.value), small)
+        if val_key != self._val_key:
+            self._val_surf = small.render(f"{int(self.value)}", True, WHITE)
+            self._val_key = val_key
+        surf.blit(self._val_surf, (self.rect.right - 32, self.rect.y + 2))
 
 
-def load_grass_images(target_size: Tuple[int, int]) -> dict:
-    images = {}
-    base_dir = os.path.dirname(__file__)
+GRASS_TILE = 64  # native size of grass1.png .. grass7.png
+
+def load_grass_tiles() -> Tuple[dict, bool]:
+    """Native-resolution grass tiles by health key; (tiles, all_loaded)."""
+    tiles = {}
+    all_loaded = True
     fallback_colors = {
         7: (34, 139, 34),
         6: (52, 153, 56),
@@ -942,17 +1362,15 @@ def load_grass_images(target_size: Tuple[int, int]) -> dict:
         1: (150, 120, 60),
     }
     for i in range(1, 8):
-        filename = f"grass{i}.png"
-        path = os.path.join(base_dir, filename)
-        try:
-            img = pygame.image.load(path).convert_alpha()
-            img = pygame.transform.scale(img, target_size)  # nearest by default in SDL2 builds
-            images[i] = img
-        except Exception:
-            surf = pygame.Surface(target_size, pygame.SRCALPHA)
+        img = ASSETS.image(f"grass{i}.png", alpha=False)
+        if img:
+            tiles[i] = img
+        else:
+            all_loaded = False
+            surf = SURFACE_POOL.new((GRASS_TILE, GRASS_TILE), 0)
             surf.fill(fallback_colors[i])
-            images[i] = surf
-    return images
+            tiles[i] = surf
+    return tiles, all_loaded
 
 def health_to_grass_key(health: float) -> int:
     if health > 90: return 7
@@ -963,6 +1381,165 @@ def health_to_grass_key(health: float) -> int:
     elif health > 40: return 2
     else: return 1
 
+class LawnRenderer:
+    """
+    Lawn background built from small tiles, with a continuous health tint.
+
+    grass1.png .. grass7.png are the same 64x64 pixel-art tile with a
+    swapped palette, so we keep that one tile, the index of every pixel into
+    its palette, and a lookup table of palettes for every integer health
+    (interpolated between the health each sprite stands for).
+
+    For a health value the tile is recolored through the LUT with surfarray,
+    upscaled by TILE_SCALE, and the lawn is composed from a precomputed tile
+    map with one Surface.blits call. The tile is a framed plot, so the map is
+    9-slice style: frame pieces along the lawn edges, the interior repeated
+    in between.
+    Composites are cached for the last few health values, and health changes
+    crossfade. Source memory stays at seven native tiles whatever the lawn size.
+
+    Without numpy (or if a sprite is missing) the tile is picked per band
+    with health_to_grass_key() instead of being tinted.
+    """
+
+    FADE_MS = 400
+    CACHE_SIZE = 3
+    TILE_SCALE = 6
+    BORDER = (2, 2, 4, 4)  # dark frame of the tile in native px: left, top, right, bottom
+    # Health at which each grassN.png is shown as-is (middle of its band)
+    ANCHORS = ((1, 35), (2, 45), (3, 55), (4, 65), (5, 75), (6, 85), (7, 95))
+
+    def __init__(self, size: Tuple[int, int]):
+        self.tiles, all_loaded = load_grass_tiles()
+        self.lut = None
+        if numpy is not None and all_loaded:
+            self._build_lut()
+
+        self._cache: "OrderedDict[int, pygame.Surface]" = OrderedDict()
+        self._shown = None
+        self._fade_from = None
+        self._fade_start = 0
+        self.resize(size)
+
+    def _build_lut(self):
+        base = self.tiles[7]
+        base_px = pygame.surfarray.array3d(base).reshape(-1, 3)
+        palette7, index = numpy.unique(base_px, axis=0, return_inverse=True)
+        index = index.reshape(-1)
+
+        # Palette of every sprite, in the order of grass7's palette
+        palettes = []
+        for i, _ in self.ANCHORS:
+            pal = numpy.zeros_like(palette7, dtype=numpy.float32)
+            pal[index] = pygame.surfarray.array3d(self.tiles[i]).reshape(-1, 3)
+            palettes.append(pal)
+
+        # lut[h] = palette for integer health h, linear between anchors
+        lut = numpy.empty((101,) + palette7.shape, dtype=numpy.uint8)
+        anchors = [h for _, h in self.ANCHORS]
+        for h in range(101):
+            if h <= anchors[0]:
+                pal = palettes[0]
+            elif h >= anchors[-1]:
+                pal = palettes[-1]
+            else:
+                k = next(j for j in range(1, len(anchors)) if h <= anchors[j])
+                t = (h - anchors[k - 1]) / (anchors[k] - anchors[k - 1])
+                pal = palettes[k - 1] * (1 - t) + palettes[k] * t
+            lut[h] = numpy.rint(pal).astype(numpy.uint8)
+
+        self.index = index.reshape(base.get_width(), base.get_height())
+        self.lut = lut
+
+    @staticmethod
+    def _slice_axis(length: int, lead: int, trail: int, full: int):
+        """
+        Pieces along one axis: (src_offset, src_len, dest_offset, dest_len).
+        Leading frame, interior repeated (the last copy cropped), trailing frame.
+        """
+        inner = full - lead - trail
+        pieces = [(0, lead, 0, lead)]
+        pos = lead
+        while pos < length - trail:
+            n = min(inner, length - trail - pos)
+            pieces.append((lead, inner, pos, n))
+            pos += n
+        pieces.append((lead + inner, trail, length - trail, trail))
+        return pieces
+
+    def resize(self, size: Tuple[int, int]):
+        """Lay out the tile map for a lawn of `size`; drops cached composites."""
+        self.size = (int(size[0]), int(size[1]))
+        S = self.TILE_SCALE
+        left, top, right, bottom = (v * S for v in self.BORDER)
+        cols = self._slice_axis(self.size[0], left, right, GRASS_TILE * S)
+        rows = self._slice_axis(self.size[1], top, bottom, GRASS_TILE * S)
+
+        # (source area in the scaled tile, dest pos); area is cropped to what's visible
+        self.tile_map = []
+        for sy, sh, dy, dh in rows:
+            for sx, sw, dx, dw in cols:
+                self.tile_map.append((pygame.Rect(sx, sy, dw, dh), (dx, dy)))
+        self._cache.clear()
+        self._shown = None
+        self._fade_from = None
+
+    def _state_key(self, health: float) -> int:
+        if self.lut is None:
+            return health_to_grass_key(health)
+        return int(clamp(health, 0, 100))
+
+    def _tile(self, key: int) -> pygame.Surface:
+        if self.lut is None:
+            tile = self.tiles[key]
+        else:
+            tile = self.tiles[7].copy()
+            px = pygame.surfarray.pixels3d(tile)
+            px[...] = self.lut[key][self.index]
+            del px  # unlock before scaling
+        S = self.TILE_SCALE
+        return pygame.transform.scale(tile, (tile.get_width() * S, tile.get_height() * S))  # nearest: keep the pixel art crisp
+
+    def surface_for(self, health: float) -> pygame.Surface:
+        key = self._state_key(health)
+        surf = self._cache.get(key)
+        if surf is not None:
+            self._cache.move_to_end(key)
+            return surf
+
+        tile = self._tile(key)
+        surf = SURFACE_POOL.new(self.size, 0)
+        surf.blits([(tile, dest, area) for area, dest in self.tile_map], doreturn=False)
+        self._cache[key] = surf
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return surf
+
+    def is_fading(self) -> bool:
+        return self._fade_from is not None
+
+    def draw(self, surface: pygame.Surface, pos, health: float):
+        target = self.surface_for(health)
+        now = pygame.time.get_ticks()
+        if self._shown is not None and target is not self._shown:
+            self._fade_from = self._shown
+            self._fade_start = now
+        self._shown = target
+
+        if self._fade_from is None:
+            surface.blit(target, pos)
+            return
+
+        t = (now - self._fade_start) / self.FADE_MS
+        if t >= 1:
+            self._fade_from = None
+            surface.blit(target, pos)
+            return
+        surface.blit(self._fade_from, pos)
+        target.set_alpha(int(255 * t))
+        surface.blit(target, pos)
+        target.set_alpha(None)
+
 def calculate_multiplier(state: GameState) -> float:
     lawn = state.lawn
     total = 1.0
@@ -1072,37 +1649,35 @@ def apply_next_month(state: GameState):
         state.in_game_over = False
 
 
-def game_over_overlay(surface: pygame.Surface, fonts):
-    FONT, TITLE, SMALL = fonts
-    # Darken the entire window
-    overlay = pygame.Surface((TOTAL_W, TOTAL_H), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))  # slightly darker than before
-    surface.blit(overlay, (0, 0))
+_OVERLAY_TEXT = {}  # overlay name -> rendered lines
 
-    # Centered messages across full screen
-    msg1 = TITLE.render("Game Over", True, RED)
-    msg2 = FONT.render("Your lawn failed. Press R to restart.", True, WHITE)
-    msg3 = SMALL.render("Tip: Taller mowing + deep watering helps!", True, WHITE)
+def _draw_end_overlay(surface: pygame.Surface, name: str, lines):
+    """Darken the whole window and centre three lines; the text is rendered once per overlay."""
+    rendered = _OVERLAY_TEXT.get(name)
+    if rendered is None:
+        rendered = _OVERLAY_TEXT[name] = [font.render(text, True, color) for font, text, color in lines]
+
+    surface.blit(SURFACE_POOL.filled((TOTAL_W, TOTAL_H), (0, 0, 0, 180)), (0, 0))
 
     cx, cy = TOTAL_W // 2, TOTAL_H // 2
-    surface.blit(msg1, msg1.get_rect(center=(cx, cy - 30)))
-    surface.blit(msg2, msg2.get_rect(center=(cx, cy + 10)))
-    surface.blit(msg3, msg3.get_rect(center=(cx, cy + 40)))
+    for ts, dy in zip(rendered, (-30, 10, 40)):
+        surface.blit(ts, ts.get_rect(center=(cx, cy + dy)))
 
-def game_won_overlay(surface: pygame.Surface, fonts):
+def game_over_overlay(surface: pygame.Surface, fonts):
     FONT, TITLE, SMALL = fonts
-    overlay = pygame.Surface((TOTAL_W, TOTAL_H), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    surface.blit(overlay, (0, 0))
+    _draw_end_overlay(surface, "over", [
+        (TITLE, "Game Over", RED),
+        (FONT, "Your lawn failed. Press R to restart.", WHITE),
+        (SMALL, "Tip: Taller mowing + deep watering helps!", WHITE),
+    ])
 
-    msg1 = TITLE.render("You Won!", True, GREEN)
-    msg2 = FONT.render("Congratulations, you kept your lawn alive for 1 year!", True, WHITE)
-    msg3 = SMALL.render("Press R to restart and try again.", True, WHITE)
-
-    cx, cy = TOTAL_W // 2, TOTAL_H // 2
-    surface.blit(msg1, msg1.get_rect(center=(cx, cy - 30)))
-    surface.blit(msg2, msg2.get_rect(center=(cx, cy + 10)))
-    surface.blit(msg3, msg3.get_rect(center=(cx, cy + 40)))
+def game_won_overlay(surface: pygame.Surface, fonts):
+    FONT, TITLE, SMALL = fonts
+    _draw_end_overlay(surface, "won", [
+        (TITLE, "You Won!", GREEN),
+        (FONT, "Congratulations, you kept your lawn alive for 1 year!", WHITE),
+        (SMALL, "Press R to restart and try again.", WHITE),
+    ])
 
 class WaterWisePane:
     def __init__(self, rect: pygame.Rect, chat: ChatUI):
@@ -1110,24 +1685,27 @@ class WaterWisePane:
         self.W, self.H = rect.w, rect.h
         self.state = GameState()
         self.chat = chat
+        self.quiz = None  # QuizModal while the month-end quiz is open
+        self.end_frame = None  # this pane, frozen once the game is over or won (draw() fills it)
+        self._root_viz = {}    # root_depth -> (panel, label)
+        self._aquifer_before = None   # aquifer level before the last month, for its trend
+        self._guide_fields = None     # what guide_state() was last built from
+        self._guide_state = {}
 
         # Panel and lawn
         panel_w = min(380, int(self.W * 0.58))
         self.panel_rect = pygame.Rect(self.rect.x + self.W - panel_w, self.rect.y, panel_w, self.H)
         self.lawn_rect  = pygame.Rect(self.rect.x, self.rect.y, self.W - panel_w, self.H)
 
-        # Lawn images
-        self.lawn_images = load_grass_images((self.lawn_rect.w, self.lawn_rect.h))
+        # Lawn background (continuous health tint)
+        self.lawn_renderer = LawnRenderer((self.lawn_rect.w, self.lawn_rect.h))
 
         # House image
-        try:
-            house_path = os.path.join(os.path.dirname(__file__), "House.png")
-            self.house_img = pygame.image.load(house_path).convert_alpha()
+        self.house_img = ASSETS.image("House.png")
+        if self.house_img:
             scale_w = int(self.lawn_rect.w * 0.45)
             scale_h = int(self.house_img.get_height() * (scale_w / self.house_img.get_width()))
-            self.house_img = pygame.transform.scale(self.house_img, (scale_w, scale_h))
-        except Exception:
-            self.house_img = None
+            self.house_img = ASSETS.image("House.png", (scale_w, scale_h))
 
         # --- Sliders ---
         self.sliders = {
@@ -1175,48 +1753,96 @@ class WaterWisePane:
 
     # ---------------- Methods ----------------
 
+    def is_animating(self) -> bool:
+        """True while the 3s failure countdown or a lawn crossfade runs."""
+        return (self.state.is_failing and not self.state.in_game_over) or self.lawn_renderer.is_fading()
+
     def handle_next_month(self):
         """Show quiz before advancing to the next month."""
-        if quiz_popup(self.state.month_count, screen, FONT, BUTTON_FONT):
-            apply_next_month(self.state)
-
-    def draw_root_visualization(self, surface: pygame.Surface, lawn_rect: pygame.Rect, root_depth: int):
+        if self.quiz is None:
+            self.quiz = QuizModal(self.state.month_count, (TOTAL_W, TOTAL_H), FONT, BUTTON_FONT,
+                                  on_done=self._finish_quiz)
+
+    def _finish_quiz(self):
+        self.quiz = None
+        self._aquifer_before = self.state.aquifer.level
+        apply_next_month(self.state)
+
+    def guide_state(self) -> Dict[str, object]:
+        """
+        The lawn as AquaGuide's game_state (see GameGuide.build_context). The
+        same dict comes back until a field it reads changes, so callers can
+        hand it over every frame.
+        """
+        lawn, aquifer = self.state.lawn, self.state.aquifer
+        change = None if self._aquifer_before is None else round(aquifer.level - self._aquifer_before)
+        fields = (lawn.grass.name, lawn.watering_idx, round(lawn.root_depth),
+                  round(aquifer.level), change, min(self.state.month_count, 12))
+        if fields != self._guide_fields:
+            self._guide_fields = fields
+            self._guide_state = {
+                "grass": lawn.grass.name, "grass_note": lawn.grass.note,
+                "watering": WATERING_OPTS[lawn.watering_idx],
+                "root_depth": fields[2], "aquifer_level": fields[3],
+                "month": fields[5],
+            }
+            if change is not None:
+                self._guide_state["aquifer_change"] = change
+        return self._guide_state
+
+    def _build_root_visualization(self, root_depth) -> Tuple[pygame.Surface, pygame.Surface]:
+        """Panel (background, ground, roots) and label for one root depth."""
         viz_w, viz_h = 120, 180
-        viz_rect = pygame.Rect(lawn_rect.x + 20, lawn_rect.bottom - viz_h - 20, viz_w, viz_h)
+        # One spare column: the ground line runs to the panel's right edge inclusive
+        panel = SURFACE_POOL.new((viz_w + 1, viz_h))
+        bg_rect = pygame.Rect(0, 0, viz_w, viz_h)
+        panel.fill((0, 0, 0, 110), bg_rect)
+        pygame.draw.rect(panel, (255, 255, 255, 150), bg_rect, width=1, border_radius=8)
 
-        bg_surf = pygame.Surface(viz_rect.size, pygame.SRCALPHA)
-        bg_surf.fill((0, 0, 0, 110))
-        pygame.draw.rect(bg_surf, (255, 255, 255, 150), bg_surf.get_rect(), width=1, border_radius=8)
-        surface.blit(bg_surf, viz_rect.topleft)
-
-        ground_y = viz_rect.y + 25
-        pygame.draw.line(surface, GREEN, (viz_rect.x, ground_y), (viz_rect.right, ground_y), 3)
+        ground_y = 25
+        pygame.draw.line(panel, GREEN, (0, ground_y), (viz_w, ground_y), 3)
 
         max_depth_px = viz_h - 40
         root_len = (root_depth / 20.0) * max_depth_px
 
         if root_len > 0:
-            start_pos = (viz_rect.centerx, ground_y)
-            end_pos = (viz_rect.centerx, ground_y + root_len)
-            pygame.draw.line(surface, (210, 180, 140), start_pos, end_pos, 3)
+            start_pos = (bg_rect.centerx, ground_y)
+            end_pos = (bg_rect.centerx, ground_y + root_len)
+            pygame.draw.line(panel, (210, 180, 140), start_pos, end_pos, 3)
             for i in range(1, 4):
                 branch_y = ground_y + (root_len * (i / 3.5))
                 branch_len = root_len * 0.2
-                pygame.draw.line(surface, (210, 180, 140), (start_pos[0], branch_y),
+                pygame.draw.line(panel, (210, 180, 140), (start_pos[0], branch_y),
                                  (start_pos[0] - branch_len, branch_y + 10), 2)
-                pygame.draw.line(surface, (210, 180, 140), (start_pos[0], branch_y),
+                pygame.draw.line(panel, (210, 180, 140), (start_pos[0], branch_y),
                                  (start_pos[0] + branch_len, branch_y + 10), 2)
 
         label = SMALL_FONT.render(f"Root Depth: {root_depth}", True, WHITE)
+        return panel, label
+
+    def draw_root_visualization(self, surface: pygame.Surface, lawn_rect: pygame.Rect, root_depth: int):
+        # root_depth only moves once a month, so each depth is drawn once and reused
+        cached = self._root_viz.get(root_depth)
+        if cached is None:
+            cached = self._root_viz[root_depth] = self._build_root_visualization(root_depth)
+        panel, label = cached
+
+        viz_rect = pygame.Rect(lawn_rect.x + 20, lawn_rect.bottom - panel.get_height() - 20,
+                               panel.get_width() - 1, panel.get_height())
+        surface.blit(panel, viz_rect.topleft)
         surface.blit(label, label.get_rect(midtop=viz_rect.midtop).move(0, 5))
 
     def draw(self, surface: pygame.Surface):
+        # Game over / won: nothing here changes until R, so reuse the frozen pane
+        if self.end_frame is not None:
+            surface.blit(self.end_frame, self.rect.topleft)
+            return "over" if self.state.in_game_over else "won"
+
         # Background
         draw_vertical_gradient(surface, self.rect, BG_TOP_GAME, BG_BOTTOM_GAME)
 
         # Lawn
-        key = health_to_grass_key(self.state.lawn.health)
-        surface.blit(self.lawn_images[key], self.lawn_rect.topleft)
+        self.lawn_renderer.draw(surface, self.lawn_rect.topleft, self.state.lawn.health)
 
         # House
         if self.house_img:
@@ -1229,9 +1855,9 @@ class WaterWisePane:
         # Panel
         pygame.draw.rect(surface, PANEL_BG, self.panel_rect)
         pygame.draw.rect(surface, PANEL_BORDER, self.panel_rect, width=2)
-        title = GAME_TITLE_FONT.render("LAWN SIMULATOR", True, WHITE)
+        title = SURFACE_POOL.text(GAME_TITLE_FONT, "LAWN SIMULATOR", WHITE)
         surface.blit(title, (self.panel_rect.x + 20, 16))
-        sub = SMALL_FONT.render(f"Month #{self.state.month_count}   |   Grass: {self.state.lawn.grass.name}", True, WHITE)
+        sub = SURFACE_POOL.text(SMALL_FONT, f"Month #{self.state.month_count}   |   Grass: {self.state.lawn.grass.name}", WHITE)
         surface.blit(sub, (self.panel_rect.x + 20, 50))
 
         # Sliders
@@ -1255,24 +1881,30 @@ class WaterWisePane:
             if pygame.time.get_ticks() - self.state.fail_start_ms >= 3000:
                 self.state.in_game_over = True
 
-        if self.state.in_game_over:
+        if not (self.state.in_game_over or self.state.in_game_won):
+            return None
+        if not self.is_animating():  # let the lawn crossfade finish first
+            self.end_frame = surface.subsurface(self.rect).copy()
+        return "over" if self.state.in_game_over else "won"
+
+    def draw_end_overlay(self, surface: pygame.Surface, status: Optional[str]):
+        """The game-over/won overlay for draw()'s status (kept out of draw() so it is profiled on its own)."""
+        if status == "over":
             game_over_overlay(surface, (FONT, GAME_TITLE_FONT, SMALL_FONT))
-            return "over"
-        elif self.state.in_game_won:
+        elif status == "won":
             game_won_overlay(surface, (FONT, GAME_TITLE_FONT, SMALL_FONT))
-            return "won"
-
-        return None
 
     def handle_event(self, ev: pygame.event.Event):
         if (self.state.in_game_over or self.state.in_game_won):
             if ev.type == pygame.KEYDOWN and ev.key == pygame.K_r:
                 self.state = GameState()
+                self._aquifer_before = None
+                self.end_frame = None
                 self.chat.disabled = False
             return
 
         if ev.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION):
-            if not self.rect.collidepoint(pygame.mouse.get_pos()):
+            if not self.rect.collidepoint(mouse_pos()):
                 return
 
         for b in self.buttons:
@@ -1280,11 +1912,6 @@ class WaterWisePane:
         for t in self.toggles:
             t.handle_event(ev)
 
-    def handle_next_month(self):
-        # show quiz before applying the next month
-        if quiz_popup(self.state.month_count, screen, FONT, BUTTON_FONT):
-            apply_next_month(self.state)
-
 class ScreenState(Enum):
     INTRO = 1
     GAME = 2
@@ -1299,12 +1926,7 @@ class IntroSlides:
         self.FONT = FONT
         self.TITLE_FONT = TITLE_FONT
 
-        self.typing_sound = None
-        try:
-            sound_path = os.path.join(os.path.dirname(__file__), "typewriter.wav")
-            self.typing_sound = pygame.mixer.Sound(sound_path)
-        except Exception:
-            self.typing_sound = None
+        self.typing_sound = ASSETS.sound("typewriter.wav")
 
         # Slides: (background, text, text_color)
         self.slides = [
@@ -1344,7 +1966,6 @@ class IntroSlides:
         ]
 
         self.current_slide = 0
-        self.typed_text = ""
         self.char_index = 0
         self.typing_speed = 3.5     # frames per character
         self.frame_count = 0
@@ -1354,6 +1975,37 @@ class IntroSlides:
         #skip button stuff
         self.skip_rect = pygame.Rect(self.W - 140, self.H - 60, 120, 40)
         self.speed_multiplier = 1.0  # normal typing/waiting speed
+        self._skip_labels = {}
+
+        # Typewriter: each slide's full text is wrapped once; typed glyphs are
+        # blitted onto persistent per-line surfaces as char_index advances.
+        self._layout_slide = None
+        self._revealed = 0
+
+        # Slide backgrounds are decoded + scaled on a loader thread while the
+        # first (black) slides type out; update() converts them to display
+        # format on the main thread, so draw() is a single blit.
+        self._bg_loaded = set()  # names the loader thread has finished with
+        self._bg_ready = {}      # name -> converted Surface (or None)
+        self._bg_loader = threading.Thread(target=self._load_backgrounds, daemon=True)
+        self._bg_loader.start()
+
+    def _load_backgrounds(self):
+        """Loader thread: decode and scale every image background once."""
+        for bg, _, _ in self.slides:
+            if bg != "black":
+                ASSETS.preload(bg, (self.W, self.H), alpha=False)
+                self._bg_loaded.add(bg)
+
+    def _prepare_background(self, bg, wait=False):
+        """Convert a preloaded background for blitting (main thread only)."""
+        if bg == "black" or bg in self._bg_ready:
+            return
+        if wait:
+            self._bg_loader.join()
+        elif bg not in self._bg_loaded:
+            return
+        self._bg_ready[bg] = ASSETS.image(bg, (self.W, self.H), alpha=False)
 
     def update(self):
         """Advance typing effect and handle timing between slides."""
@@ -1362,12 +2014,15 @@ class IntroSlides:
 
         bg, text, color = self.slides[self.current_slide]
 
+        # Have the next slide's background ready before we switch to it
+        if self.current_slide + 1 < len(self.slides):
+            self._prepare_background(self.slides[self.current_slide + 1][0])
+
         if self.char_index < len(text):
             # Typing effect
             self.frame_count += 1
             if self.frame_count >= self.typing_speed / self.speed_multiplier:
                 self.char_index += 1
-                self.typed_text = text[:self.char_index]
                 self.frame_count = 0
 
                 # 🔊 Typing sound (skip spaces)
@@ -1389,14 +2044,12 @@ class IntroSlides:
                             # Second-to-last slide → advance to last
                             self.current_slide += 1
                             self.char_index = 0
-                            self.typed_text = ""
                             self.frame_count = 0
                             self.wait_timer = 0
                 else:
                     # Normal slide timing
                     self.current_slide += 1
                     self.char_index = 0
-                    self.typed_text = ""
                     self.frame_count = 0
                     self.wait_timer = 0
 
@@ -1415,45 +2068,37 @@ class IntroSlides:
         bg, full_text, color = self.slides[self.current_slide]
 
         # --- Draw background first ---
-        if bg == "black":
-            surface.fill((0, 0, 0))
+        self._prepare_background(bg, wait=True)
+        img = self._bg_ready.get(bg)
+        if img:
+            surface.blit(img, (0, 0))
         else:
-            try:
-                img = pygame.image.load(os.path.join(os.path.dirname(__file__), bg)).convert()
-                img = pygame.transform.scale(img, (self.W, self.H))
-                surface.blit(img, (0, 0))
-            except Exception:
-                surface.fill((0, 0, 0))
-
-        # --- Then draw text ---
-        max_width = int(self.W * 0.6)
-        lines = self.wrap_text(self.typed_text, self.FONT, max_width)
-        line_heights = [self.FONT.size(line)[1] for line in lines]
-        total_height = sum(line_heights) + (len(lines) - 1) * 10
-        y = (self.H - total_height) // 2
-        for line in lines:
-            ts = self.FONT.render(line, True, color)
-            surface.blit(ts, (self.W // 2 - ts.get_width() // 2, y))
-            y += ts.get_height() + 10
+            surface.fill((0, 0, 0))
+
+        # --- Then draw text (revealed lines, centred as typed so far) ---
+        self._reveal()
+        line_h = self.FONT.get_height()
+        n = self._lines_shown
+        y = (self.H - (n * line_h + (n - 1) * 10)) // 2
+        for i in range(n):
+            w = self._shown_w[i][self._line_chars[i]]
+            surface.blit(self._line_surfs[i], (self.W // 2 - w // 2, y), (0, 0, w, line_h))
+            y += line_h + 10
 
         # --- Cursor ---
         if self.char_index < len(full_text) or pygame.time.get_ticks() % 1000 < 500:
-            if lines:
-                last_line = lines[-1]
-                last_ts = self.FONT.render(last_line, True, color)
-                cursor_x = self.W // 2 + (last_ts.get_width() // 2) + 5
-                cursor_y = y - last_ts.get_height() - 10
-                pygame.draw.line(surface, color,
-                                 (cursor_x, cursor_y),
-                                 (cursor_x, cursor_y + last_ts.get_height()), 2)
+            cursor_x = self.W // 2 + (w // 2) + 5
+            cursor_y = y - line_h - 10
+            pygame.draw.line(surface, color,
+                             (cursor_x, cursor_y),
+                             (cursor_x, cursor_y + line_h), 2)
 
         # --- Finally draw Skip/Fast Button (always on top) ---
         if not self.done and self.skip_rect:
             pygame.draw.rect(surface, (200, 200, 200), self.skip_rect, border_radius=8)
             pygame.draw.rect(surface, (100, 100, 100), self.skip_rect, width=2, border_radius=8)
 
-            label = ">> Faster" if self.speed_multiplier == 1.0 else "Fast!"
-            txt = self.FONT.render(label, True, (0, 0, 0))
+            txt = self._skip_label()
             surface.blit(txt, (
                 self.skip_rect.centerx - txt.get_width() // 2,
                 self.skip_rect.centery - txt.get_height() // 2
@@ -1466,14 +2111,64 @@ class IntroSlides:
         pygame.draw.rect(surface, (200, 200, 200), self.skip_rect, border_radius=8)
         pygame.draw.rect(surface, (0, 0, 0), self.skip_rect, width=3, border_radius=8)  # thicker outline
 
-        label = ">> Faster" if self.speed_multiplier == 1.0 else "Fast!"
-        txt = self.FONT.render(label, True, (0, 0, 0))
+        txt = self._skip_label()
         surface.blit(
             txt,
             (self.skip_rect.centerx - txt.get_width() // 2,
              self.skip_rect.centery - txt.get_height() // 2),
         )
 
+    def _skip_label(self) -> pygame.Surface:
+        label = ">> Faster" if self.speed_multiplier == 1.0 else "Fast!"
+        txt = self._skip_labels.get(label)
+        if txt is None:
+            txt = self._skip_labels[label] = self.FONT.render(label, True, (0, 0, 0))
+        return txt
+
+    def _layout(self):
+        """Wrap the current slide's full text once and map every character to its line/column."""
+        _, text, _ = self.slides[self.current_slide]
+        lines = self.wrap_text(text, self.FONT, int(self.W * 0.6))
+        line_h = self.FONT.get_height()
+
+        self._char_pos = []   # text index -> (line, column); column None for a space eaten by wrapping
+        pos = 0
+        for i, line in enumerate(lines):
+            start = text.find(line, pos)  # lines are stripped slices of the text, in order
+            self._char_pos += [(max(i - 1, 0), None)] * (start - pos)
+            self._char_pos += [(i, c) for c in range(len(line))]
+            pos = start + len(line)
+        self._char_pos += [(len(lines) - 1, None)] * (len(text) - pos)
+
+        # x of each column, and the (right-stripped) width shown after k characters
+        self._prefix_x = [[self.FONT.size(line[:k])[0] for k in range(len(line) + 1)] for line in lines]
+        self._shown_w = [[xs[len(line[:k].rstrip())] for k in range(len(line) + 1)]
+                         for line, xs in zip(lines, self._prefix_x)]
+        self._line_surfs = [SURFACE_POOL.new((max(1, xs[-1]), line_h)) for xs in self._prefix_x]
+        self._line_chars = [0] * len(lines)
+        self._lines_shown = 1
+        self._revealed = 0
+        self._layout_slide = self.current_slide
+
+    def _reveal(self):
+        """Blit the glyphs typed since the last frame onto their line surfaces."""
+        if self._layout_slide != self.current_slide:
+            self._layout()
+        _, text, color = self.slides[self.current_slide]
+        while self._revealed < self.char_index:
+            ch = text[self._revealed]
+            line, col = self._char_pos[self._revealed]
+            self._revealed += 1
+            self._lines_shown = line + 1
+            if col is None:
+                continue
+            self._line_chars[line] = col + 1
+            if ch != " ":
+                glyph = SURFACE_POOL.text(self.FONT, ch, color)
+                # MAX keeps the glyph's own colour + coverage on the transparent line surface
+                self._line_surfs[line].blit(glyph, (self._prefix_x[line][col], 0),
+                                            special_flags=pygame.BLEND_RGBA_MAX)
+
     def wrap_text(self, text, font, max_width):
         """Word-wrap text to fit a max width."""
         words = text.split(" ")
@@ -1491,56 +2186,120 @@ class IntroSlides:
         return lines
 
 
+class FramePacer:
+    """
+    Adaptive frame scheduling for main(): full FPS while something animates,
+    otherwise block in pygame.event.wait() until input arrives, the next
+    deadline (e.g. cursor blink) is due, or IDLE_FPS forces a redraw.
+    """
+
+    def __init__(self, fps: int = FPS, idle_fps: int = IDLE_FPS):
+        self.fps = fps
+        self.idle_ms = 1000 // idle_fps
+        self.clock = pygame.time.Clock()
+        self.idle = False
+
+    def next_frame(self, active: bool, wake_in_ms: Optional[int] = None):
+        """Wait for the next frame; returns (dt_ms, events)."""
+        self.idle = not active
+        if active:
+            dt = self.clock.tick(self.fps)
+            return dt, pygame.event.get()
+
+        timeout = self.idle_ms if wake_in_ms is None else max(1, min(self.idle_ms, wake_in_ms))
+        first = pygame.event.wait(timeout)
+        events = pygame.event.get()
+        if first.type != pygame.NOEVENT:
+            events.insert(0, first)
+        dt = self.clock.tick(self.fps)  # still never faster than full rate
+        return dt, events
+
+
 def main():
     state = ScreenState.INTRO
     intro = IntroSlides((TOTAL_W, TOTAL_H), FONT, TITLE_FONT)
 
-    clock = pygame.time.Clock()
+    pacer = FramePacer()
     chat = ChatUI(CHAT_RECT, (FONT, TITLE_FONT, BUTTON_FONT))
     lawn = WaterWisePane(GAME_RECT, chat)
 
+    # The network sits idle through the intro: connect, and fetch the canned prompts' answers now
+    # (for the starting lawn; set_game_state() fetches them again when the grass or watering changes)
+    set_game_state(lawn.guide_state())
+    warm_up()
+    prefetch_answers([prompt for _, prompt in chat.predefined_buttons], workers=2)
+
     running = True
     while running:
-        dt = clock.tick(FPS)
+        # The intro's typing/timing is frame-based, so it always runs at full rate
+        if state == ScreenState.INTRO or PROFILER.hud_visible:
+            active, wake_in = True, None
+        else:
+            active = chat.is_animating() or lawn.is_animating()
+            wake_in = chat.ms_until_redraw()
+        dt, events = pacer.next_frame(active, wake_in)
+        frame_start = time.perf_counter()
+        frame_changed = True
+        SURFACE_POOL.begin_frame()
+
+        with PROFILER.section("events"):
+            for ev in events:
+                ev = PRESENTER.map_event(ev)
+                if ev.type in (pygame.QUIT, pygame.WINDOWCLOSE):
+                    running = False
+                    break
+                if ev.type == pygame.KEYDOWN and ev.key == pygame.K_ESCAPE:
+                    running = False
+                    break
+                if ev.type == pygame.KEYDOWN and ev.key == pygame.K_F3:
+                    PROFILER.toggle_hud()
+                    continue
+
+                # AquaGuide answers aren't input: they always go to the chat
+                if ev.type in (SLM_CHUNK, SLM_REPLY):
+                    chat.handle_event(ev)
+                    continue
 
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT:
-                running = False
-                break
-            if ev.type == pygame.KEYDOWN and ev.key == pygame.K_ESCAPE:
-                running = False
-                break
+                # The month-end quiz is modal: it takes all input while open
+                if lawn.quiz:
+                    lawn.quiz.handle_event(ev)
+                    continue
 
-            # Play pop sound on *any* button press (mouse clicks)
-            if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
-                if chat.pop_sound:
-                    try:
-                        chat.pop_sound.play()
-                    except Exception:
-                        pass
+                # Play pop sound on *any* button press (mouse clicks)
+                if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
+                    if chat.pop_sound:
+                        try:
+                            chat.pop_sound.play()
+                        except Exception:
+                            pass
 
-            # Play pop sound on RETURN/ENTER key
-            if ev.type == pygame.KEYDOWN and ev.key == pygame.K_RETURN:
-                if chat.pop_sound:
-                    try:
-                        chat.pop_sound.play()
-                    except Exception:
-                        pass
+                # Play pop sound on RETURN/ENTER key
+                if ev.type == pygame.KEYDOWN and ev.key == pygame.K_RETURN:
+                    if chat.pop_sound:
+                        try:
+                            chat.pop_sound.play()
+                        except Exception:
+                            pass
 
-            # Route events to both panes (mouse routed by pane containment)
+                # Route events to both panes (mouse routed by pane containment)
 
-            if state == ScreenState.INTRO:
-                intro.handle_event(ev)  # let intro slides handle button click
+                if state == ScreenState.INTRO:
+                    intro.handle_event(ev)  # let intro slides handle button click
 
-            chat.handle_event(ev)
-            lawn.handle_event(ev)
+                chat.handle_event(ev)
+                lawn.handle_event(ev)
+
+        # AquaGuide's next answer is about the lawn as it is now
+        set_game_state(lawn.guide_state())
 
         # Updates
         if state == ScreenState.INTRO:
-            done = intro.update()
-            intro.draw(screen)
+            with PROFILER.section("intro.update"):
+                done = intro.update()
+            with PROFILER.section("intro.draw"):
+                intro.draw(screen)
 
-            intro.draw_fast_button(screen) #MAKE SURE THE BUTTON IS ON TOP
+                intro.draw_fast_button(screen) #MAKE SURE THE BUTTON IS ON TOP
 
             if done:
                 state = ScreenState.GAME
@@ -1550,21 +2309,58 @@ def main():
                     BG_LOOP.play(loops=-1)
 
         elif state == ScreenState.GAME:
-            chat.update(dt)
-            chat.draw(screen)
-            status = lawn.draw(screen)
-            if status in ("over", "won"):
-                chat.disabled = True
-
-            # Divider bar
-            divider_rect = pygame.Rect(GAME_RECT.right, 0, DIVIDER_W, TOTAL_H)
-            pygame.draw.rect(screen, DIVIDER_COLOR, divider_rect)
-
-        pygame.display.flip()
+            with PROFILER.section("chat.update"):
+                cursor_was = chat.cursor_visible
+                chat.update(dt)
+            # An idle wake-up with no input and no cursor blink leaves the frame as it was.
+            # After game over the chat stays live (late answers still land); the lawn is frozen.
+            frame_changed = active or bool(events) or chat.cursor_visible != cursor_was
+            if frame_changed:
+                with PROFILER.section("chat.draw"):
+                    chat.draw(screen)
+                with PROFILER.section("lawn.draw"):
+                    status = lawn.draw(screen)
+                if status in ("over", "won"):
+                    with PROFILER.section("overlays"):
+                        lawn.draw_end_overlay(screen, status)
+
+                # Divider bar
+                divider_rect = pygame.Rect(GAME_RECT.right, 0, DIVIDER_W, TOTAL_H)
+                pygame.draw.rect(screen, DIVIDER_COLOR, divider_rect)
+
+                if lawn.quiz:
+                    with PROFILER.section("overlays"):
+                        lawn.quiz.draw(screen)
+
+                if status in ("over", "won"):
+                    chat.disabled = True
+
+        SURFACE_POOL.end_frame()
+        PROFILER.set_counter("surface allocs/frame", SURFACE_POOL.frame_allocations)
+        PROFILER.set_counter("asset hit rate", round(ASSETS.stats()["hit_rate"], 3))
+        PROFILER.set_counter("slm in flight", SLM.in_flight())
+        PROFILER.draw_hud(screen, SMALL_FONT)
+
+        with PROFILER.section("display.flip"):
+            PRESENTER.present(state == ScreenState.INTRO or frame_changed)
+        PROFILER.record("frame", (time.perf_counter() - frame_start) * 1000.0)
+        PROFILER.record("frame.interval", dt)
 
     if BG_LOOP:
         BG_LOOP.stop()
 
+    # ELD_PROFILE_DUMP=path writes the timings on exit; so does having opened the
+    # HUD, to frame_profile.json in the temp directory
+    dump_path = os.environ.get("ELD_PROFILE_DUMP") or (
+        os.path.join(tempfile.gettempdir(), "frame_profile.json") if PROFILER.hud_used else None)
+    if dump_path:
+        try:
+            PROFILER.dump(dump_path)
+        except OSError as e:
+            print("Could not write frame profile:", e)
+        else:
+            print("Frame profile written to", dump_path)
+
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+class RollingTimings:
+    """Fixed-size ring buffer of the most recent samples (milliseconds)."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.samples: List[float] = []
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, ms: float):
+        if len(self.samples) < self.capacity:
+            self.samples.append(ms)
+        else:
+            self.samples[self.index] = ms
+        self.index = (self.index + 1) % self.capacity
+        self.count += 1
+        self.total += ms
+
+    def percentiles(self, *ps: float) -> List[float]:
+        if not self.samples:
+            return [0.0 for _ in ps]
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return [ordered[min(last, int(round(p / 100.0 * last)))] for p in ps]
+
+    def summary(self) -> dict:
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "max_ms": max(self.samples) if self.samples else 0.0,
+        }
+
+
+class FrameProfiler:
+    """
+    Times named sections of the frame (and anything else: SLM round-trips,
+    asset loads) into per-section ring buffers.
+    - `with PROFILER.section("chat.draw"): ...` or PROFILER.record(name, ms).
+    - draw_hud() renders rolling p50/p95/p99 per section; F3 toggles it in-game.
+    - dump() writes the summary as JSON (main() does this on exit).
+    """
+
+    def __init__(self, capacity: int = 600, hud_refresh_ms: int = 250):
+        self.capacity = capacity
+        self.hud_refresh_ms = hud_refresh_ms
+        self.hud_visible = False
+        self.hud_used = False
+        self.timings: Dict[str, RollingTimings] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._hud_lines = []
+        self._hud_updated = 0.0
+
+    def record(self, name: str, ms: float):
+        with self._lock:
+            t = self.timings.get(name)
+            if t is None:
+                t = self.timings[name] = RollingTimings(self.capacity)
+            t.add(ms)
+
+    @contextmanager
+    def section(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - t0) * 1000.0)
+
+    def set_counter(self, name: str, value: float):
+        """Latest value of a gauge shown under the timings (allocations, cache hit rate...)."""
+        self.counters[name] = value
+
+    def summary(self) -> dict:
+        with self._lock:
+            timings = {name: t.summary() for name, t in self.timings.items()}
+        return {"sections": timings, "counters": dict(self.counters)}
+
+    def dump(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2, sort_keys=True)
+
+    def toggle_hud(self):
+        self.hud_visible = not self.hud_visible
+        self.hud_used = True
+        self._hud_updated = 0.0
+
+    def draw_hud(self, surface, font, pos=(8, 8)):
+        """Black box with one line per section; text is re-rendered a few times a second."""
+        if not self.hud_visible:
+            return
+        now = time.perf_counter() * 1000.0
+        if now - self._hud_updated >= self.hud_refresh_ms:
+            self._hud_updated = now
+            summary = self.summary()
+            rows = [f"{'section':<16} {'p50':>6} {'p95':>6} {'p99':>6}"]
+            for name in sorted(summary["sections"]):
+                s = summary["sections"][name]
+                rows.append(f"{name[:16]:<16} {s['p50_ms']:6.2f} {s['p95_ms']:6.2f} {s['p99_ms']:6.2f}")
+            for name in sorted(summary["counters"]):
+                rows.append(f"{name}: {summary['counters'][name]:g}")
+            self._hud_lines = [font.render(r, True, (255, 255, 255)) for r in rows]
+
+        if not self._hud_lines:
+            return
+        line_h = self._hud_lines[0].get_height() + 2
+        w = max(ts.get_width() for ts in self._hud_lines) + 16
+        h = line_h * len(self._hud_lines) + 12
+        surface.fill((0, 0, 0), (pos[0], pos[1], w, h))
+        y = pos[1] + 6
+        for ts in self._hud_lines:
+            surface.blit(ts, (pos[0] + 8, y))
+            y += line_h
+
+
+PROFILER = FrameProfiler()
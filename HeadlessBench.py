@@ -0,0 +1,354 @@
+"""
+Headless render benchmark and regression check for Every Last Drop.
+
+Drives IntroSlides, ChatUI and WaterWisePane through scripted frames on the
+SDL dummy driver (no window, no sound card). pygame.time.get_ticks() and the
+mouse position come from a scripted clock/mouse, so every run draws exactly
+the same pixels and each frame can be hashed.
+
+    python HeadlessBench.py                         # timings + frame digests
+    python HeadlessBench.py --json bench.json       # write the report (use as a baseline)
+    python HeadlessBench.py --check bench.json      # exit 1 if any scene renders differently
+    python HeadlessBench.py --save-png out/         # also write captured frames as PNG
+    python HeadlessBench.py --save-raw out/         # ... or as raw RGB buffers
+    python HeadlessBench.py --window 1920x1080      # include Presenter scaling in the timings
+    python HeadlessBench.py --backend texture       # ... same drawing, presented (scaled) by the _sdl2 renderer
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+# Must be set before pygame (and the game module, which opens its window on import)
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ.setdefault("OPENAI_API_KEY", "headless-bench")  # chat is never submitted here
+os.environ.setdefault("ELD_RESPONSE_CACHE", "off")  # ...so nothing is written next to the game
+
+import pygame
+
+
+class ScriptedClock:
+    """Stands in for pygame.time.get_ticks(): time only moves when a frame is stepped."""
+
+    def __init__(self, fps: int = 60):
+        self.fps = fps
+        self.frame = 0
+
+    def get_ticks(self) -> int:
+        return self.frame * 1000 // self.fps
+
+    def advance(self) -> int:
+        """Step one frame; returns dt in ms like Clock.tick()."""
+        before = self.get_ticks()
+        self.frame += 1
+        return self.get_ticks() - before
+
+
+class ScriptedMouse:
+    """Stands in for pygame.mouse.get_pos(); scenes move it before sending mouse events."""
+
+    def __init__(self):
+        self.pos = (0, 0)
+
+    def get_pos(self):
+        return self.pos
+
+
+CLOCK = ScriptedClock()
+MOUSE = ScriptedMouse()
+pygame.time.get_ticks = CLOCK.get_ticks
+pygame.mouse.get_pos = MOUSE.get_pos
+
+import EveryLastDrop as E
+from FrameProfiler import PROFILER, FrameProfiler
+
+
+# ---------------------- Scripted input ----------------------
+def click(pos):
+    MOUSE.pos = pos
+    return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1),
+            pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1)]
+
+def motion(pos):
+    rel = (pos[0] - MOUSE.pos[0], pos[1] - MOUSE.pos[1])
+    MOUSE.pos = pos
+    return [pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=rel, buttons=(0, 0, 0))]
+
+def wheel(y):
+    return [pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=y, flipped=False)]
+
+def key(ch):
+    code = pygame.K_BACKSPACE if ch == "\b" else (ord(ch) if ch.isascii() else 0)
+    return [pygame.event.Event(pygame.KEYDOWN, key=code, unicode="" if ch == "\b" else ch, mod=0)]
+
+
+# ---------------------- Frame capture ----------------------
+class SceneRun:
+    """
+    Steps one scene frame by frame:
+    - advances the scripted clock, runs the scene's update, times its draw;
+    - hashes every frame into the scene digest (sha256 of the RGB buffer);
+    - keeps per-frame hashes and optional PNG/raw dumps every `capture_every` frames.
+    """
+
+    def __init__(self, name: str, args, timings: FrameProfiler):
+        self.name = name
+        self.max_frames = args.frames
+        self.capture_every = args.capture_every
+        self.save_png = args.save_png
+        self.save_raw = args.save_raw
+        self.present = args.window is not None or args.backend != "software"
+        self.timings = timings
+        self.frames = 0
+        self.digest = hashlib.sha256()
+        self.captures = {}
+
+    @property
+    def done(self) -> bool:
+        return self.frames >= self.max_frames
+
+    def frame(self, draw, update=None):
+        dt = CLOCK.advance()
+        if update:
+            update(dt)
+        with self.timings.section(self.name):
+            draw(E.screen)
+        if self.present:
+            with self.timings.section(self.name + ".present"):
+                E.PRESENTER.present(True)
+        self._capture()
+        self.frames += 1
+
+    def _capture(self):
+        buf = pygame.image.tobytes(E.screen, "RGB")
+        self.digest.update(buf)
+        if self.frames % self.capture_every:
+            return
+        self.captures[self.frames] = hashlib.sha256(buf).hexdigest()
+        stem = f"{self.name}_{self.frames:05d}"
+        if self.save_png:
+            pygame.image.save(E.screen, os.path.join(self.save_png, stem + ".png"))
+        if self.save_raw:
+            w, h = E.screen.get_size()
+            with open(os.path.join(self.save_raw, f"{stem}_{w}x{h}.rgb"), "wb") as f:
+                f.write(buf)
+
+    def report(self) -> dict:
+        return {
+            "frames": self.frames,
+            "digest": self.digest.hexdigest(),
+            "captures": {str(k): v for k, v in self.captures.items()},
+            "draw": self.timings.timings[self.name].summary() if self.frames else {},
+        }
+
+
+# ---------------------- Scenes ----------------------
+def scene_intro(run: SceneRun):
+    """All six slides; "Faster" is clicked partway through the second one."""
+    intro = E.IntroSlides((E.TOTAL_W, E.TOTAL_H), E.FONT, E.TITLE_FONT)
+
+    def draw(surface):
+        intro.draw(surface)
+        intro.draw_fast_button(surface)
+
+    while not run.done:
+        if run.frames == 400:
+            for ev in click(intro.skip_rect.center):
+                intro.handle_event(ev)
+        if intro.update():
+            break
+        run.frame(draw)
+
+
+def scene_chat(run: SceneRun):
+    """Blinking cursor, typing, wheel scroll with inertia, hovering and paging the prompt row."""
+    chat = E.ChatUI(E.CHAT_RECT, (E.FONT, E.TITLE_FONT, E.BUTTON_FONT))
+    for i in range(8):
+        chat.chat_history.append(("You", f"How often should I water my lawn in month {i + 1}?"))
+        chat.chat_history.append(("AquaGuide", "Water deeply but infrequently so roots grow down.\n"
+                                               "Mow high and leave the clippings. " * 2))
+
+    def step(events=()):
+        if run.done:
+            return
+        for ev in events:
+            chat.handle_event(ev)
+        run.frame(chat.draw, chat.update)
+
+    for _ in range(60):
+        step()
+    for ch in "how deep should my roots be?\b\b\b\b\bgrow?":
+        step(key(ch))
+        step()
+    MOUSE.pos = chat.rect.center
+    for _ in range(4):
+        step(wheel(3))
+    for _ in range(60):
+        step()
+    area = chat.button_scroll_area
+    for x in range(area.left, area.right, 6):
+        step(motion((x, area.centery)))
+    for _ in range(3):
+        step(click(chat.right_arrow_rect.center))
+        for x in range(area.left, area.right, 24):
+            step(motion((x, area.centery)))
+    for _ in range(3):
+        step(click(chat.left_arrow_rect.center))
+        step()
+
+
+def scene_game(run: SceneRun):
+    """A winning year (quiz every month), then a restart and a quick loss."""
+    chat = E.ChatUI(E.CHAT_RECT, (E.FONT, E.TITLE_FONT, E.BUTTON_FONT))
+    lawn = E.WaterWisePane(E.GAME_RECT, chat)
+    divider = pygame.Rect(E.GAME_RECT.right, 0, E.DIVIDER_W, E.TOTAL_H)
+
+    def draw(surface):  # mirrors main()
+        chat.draw(surface)
+        status = lawn.draw(surface)
+        lawn.draw_end_overlay(surface, status)
+        pygame.draw.rect(surface, E.DIVIDER_COLOR, divider)
+        if lawn.quiz:
+            lawn.quiz.draw(surface)
+        if status in ("over", "won"):
+            chat.disabled = True
+
+    def step(events=(), frames=1):
+        for ev in events:
+            if lawn.quiz:
+                lawn.quiz.handle_event(ev)
+                continue
+            chat.handle_event(ev)
+            lawn.handle_event(ev)
+        for _ in range(frames):
+            if run.done:
+                return
+            run.frame(draw, chat.update)
+
+    def play_month(watering_idx):
+        while lawn.state.lawn.watering_idx != watering_idx:
+            step(click(lawn.tog_water.right_rect.center))
+        step(frames=10)
+        step(click(lawn.btn_next.rect.center), frames=20)
+        if lawn.quiz:
+            step(click(lawn.quiz.true_btn.center), frames=20)
+            step(click(lawn.quiz.exit_btn.center), frames=40)  # covers the lawn crossfade
+
+    step(frames=30)
+    step(click(lawn.tog_grass.left_rect.center), frames=10)  # St. Augustine -> Bahia
+    month = 0
+    while not (lawn.state.in_game_won or lawn.state.in_game_over or run.done):
+        play_month(3 if month % 2 == 0 else 1)  # Heavy / Light Infrequent
+        month += 1
+    step(frames=60)
+
+    step(key("r"), frames=10)
+    while not (lawn.state.in_game_over or run.done):
+        play_month(2)  # Heavy Frequent drains the aquifer and the roots
+    step(frames=60)
+
+
+SCENES = {
+    "intro": scene_intro,
+    "chat": scene_chat,
+    "game": scene_game,
+}
+
+
+# ---------------------- Main ----------------------
+def parse_size(text: str):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+def run_bench(args) -> dict:
+    if args.backend == "texture":
+        if E.sdl2_video is None:
+            raise SystemExit("pygame._sdl2 is not available")
+        # Any renderer will do here, so the path can be measured on the dummy driver too
+        E.PRESENTER = E.TexturePresenter(args.window or E.screen.get_size(), logical=E.screen,
+                                         accelerated=False)
+    elif args.window:
+        pygame.display.set_mode(args.window, pygame.RESIZABLE)
+    for d in (args.save_png, args.save_raw):
+        if d:
+            os.makedirs(d, exist_ok=True)
+
+    timings = FrameProfiler(capacity=args.frames)
+    report = {"backend": args.backend,
+              "logical_size": list(E.screen.get_size()),
+              "window_size": list(args.window) if args.window else None,
+              "scenes": {}}
+    for name in args.scenes:
+        CLOCK.frame = 0
+        MOUSE.pos = (0, 0)
+        E.screen.fill((0, 0, 0))  # chat only draws its own pane; don't inherit the last scene
+        run = SceneRun(name, args, timings)
+        t0 = time.perf_counter()
+        SCENES[name](run)
+        scene = run.report()
+        scene["wall_s"] = round(time.perf_counter() - t0, 3)
+        if run.present and run.frames:
+            scene["present"] = timings.timings[name + ".present"].summary()
+        report["scenes"][name] = scene
+    report["sections"] = PROFILER.summary()["sections"]
+    report["surface_pool"] = {"allocations": E.SURFACE_POOL.allocations}
+    report["assets"] = E.ASSETS.stats()
+    return report
+
+def compare(report: dict, baseline: dict) -> list:
+    """Scenes whose pixels differ from the baseline, with the first differing capture."""
+    problems = []
+    for name, scene in report["scenes"].items():
+        base = baseline.get("scenes", {}).get(name)
+        if base is None or scene["digest"] == base["digest"]:
+            continue
+        first = next((f for f, h in sorted(scene["captures"].items(), key=lambda kv: int(kv[0]))
+                      if base["captures"].get(f) != h), None)
+        problems.append(f"{name}: frames differ from baseline"
+                        + (f" (first differing capture: frame {first})" if first else "")
+                        + (f"; {base['frames']} -> {scene['frames']} frames" if base["frames"] != scene["frames"] else ""))
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenes", nargs="+", choices=list(SCENES), default=list(SCENES))
+    parser.add_argument("--frames", type=int, default=3000, help="max frames per scene")
+    parser.add_argument("--capture-every", type=int, default=30, help="keep a hash (and dump) every N frames")
+    parser.add_argument("--window", type=parse_size, default=None, help="window size, e.g. 1920x1080")
+    parser.add_argument("--backend", choices=["software", "texture"], default="software")
+    parser.add_argument("--save-png", metavar="DIR")
+    parser.add_argument("--save-raw", metavar="DIR")
+    parser.add_argument("--json", metavar="PATH", help="write the full report here")
+    parser.add_argument("--check", metavar="BASELINE", help="compare digests against a saved report")
+    args = parser.parse_args(argv)
+
+    report = run_bench(args)
+
+    print(f"{'scene':<8} {'frames':>6} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}  digest")
+    for name, s in report["scenes"].items():
+        d = s["draw"] or {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+        print(f"{name:<8} {s['frames']:>6} {d['p50_ms']:7.2f} {d['p95_ms']:7.2f} {d['p99_ms']:7.2f}  {s['digest'][:16]}")
+        if "present" in s:
+            p = s["present"]
+            print(f"{'  present':<15} {p['p50_ms']:7.2f} {p['p95_ms']:7.2f} {p['p99_ms']:7.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.check:
+        with open(args.check) as f:
+            problems = compare(report, json.load(f))
+        for p in problems:
+            print("MISMATCH", p)
+        if problems:
+            return 1
+        print("All scenes match", args.check)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 import pygame
 import sys
 from ChatWithSLMNew import chat_with_slm  # AquaGuide logic
+from AssetManager import ASSETS
 
 # Initialize pygame
 pygame.init()
@@ -372,8 +373,9 @@ def submit_question(prompt=None):
             response = f"[Error contacting SLM: {e}]"
 
         # TEST2
-        pop_sound = pygame.mixer.Sound("soundeffects/pop.wav")
-        pop_sound.play()
+        pop_sound = ASSETS.sound("soundeffects/pop.wav") or ASSETS.sound("pop.wav")
+        if pop_sound:
+            pop_sound.play()
 
         #starts thinking
         chat_history.append(("AquaGuide", response))
@@ -0,0 +1,180 @@
+"""
+Local stand-in for the OpenAI Responses endpoint, for trying AquaGuide
+without an API key or network (and for timing streaming on a known clock).
+
+    python LocalSLMServer.py --port 8765 --ttft 0.4 --token-delay 0.03
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=local python EveryLastDrop.py
+
+GET /v1/models lists one stand-in model (what a client warm-up calls);
+POST /v1/responses answers every question with a canned tip:
+- "stream": true  -> text/event-stream, one response.output_text.delta per word,
+                     `ttft` seconds before the first and `token_delay` between the rest;
+- otherwise       -> a single JSON response once the whole answer is "generated".
+With --fail-first N the first N answers are --fail-status errors instead
+(429 or 5xx, optionally with Retry-After), to exercise client retries.
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+DEFAULT_ANSWER = (
+    "Great question! Water deeply but less often, about once or twice a week, "
+    "so the roots chase the moisture down and your lawn handles dry spells better. "
+    "Mow high, leave the clippings, and every gallon you save stays in the aquifer."
+)
+
+
+def split_tokens(text: str) -> List[str]:
+    """Word-sized deltas, each carrying its leading space like real model tokens."""
+    words = text.split(" ")
+    return [words[0]] + [" " + w for w in words[1:]]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StandInServer"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def do_GET(self):
+        if not self.path.rstrip("/").endswith("/models"):
+            self.send_error(404)
+            return
+        self._send_json(200, {"object": "list", "data": [
+            {"id": "stand-in", "object": "model", "created": 0, "owned_by": "local"}]})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/responses"):
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.server.requests += 1
+        if self.server.requests <= self.server.fail_first:
+            self._fail(self.server.fail_status)
+            return
+        answer = self.server.answer
+        if body.get("stream"):
+            self._stream(body, answer)
+        else:
+            time.sleep(self.server.ttft + self.server.token_delay * len(split_tokens(answer)))
+            self._send_json(200, self._response(body, answer, "completed"))
+
+    # ---------- Responses payloads ----------
+    def _response(self, body: dict, text: str, status: str) -> dict:
+        return {
+            "id": "resp_" + uuid.uuid4().hex,
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": status,
+            "model": body.get("model", "stand-in"),
+            "output": [{
+                "id": "msg_local",
+                "type": "message",
+                "role": "assistant",
+                "status": status,
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }] if text else [],
+        }
+
+    def _send_json(self, code: int, payload: dict):
+        data = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _fail(self, status: int):
+        data = json.dumps({"error": {"message": f"stand-in failure {status}", "type": "server_error",
+                                     "param": None, "code": None}}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.server.retry_after is not None:
+            self.send_header("Retry-After", str(self.server.retry_after))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, body: dict, answer: str):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        events: List[Tuple[float, dict]] = [(0.0, {"type": "response.created", "response": self._response(body, "", "in_progress")})]
+        for i, tok in enumerate(split_tokens(answer)):
+            events.append((self.server.ttft if i == 0 else self.server.token_delay, {
+                "type": "response.output_text.delta", "item_id": "msg_local",
+                "output_index": 0, "content_index": 0, "delta": tok}))
+        events.append((0.0, {"type": "response.completed", "response": self._response(body, answer, "completed")}))
+
+        try:
+            for seq, (delay, event) in enumerate(events):
+                if delay:
+                    time.sleep(delay)
+                event["sequence_number"] = seq
+                self._chunk(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode())
+            self._chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up mid-stream
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, answer: str = DEFAULT_ANSWER, ttft: float = 0.4,
+                 token_delay: float = 0.03, verbose: bool = False, fail_first: int = 0,
+                 fail_status: int = 503, retry_after: Optional[float] = None):
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.answer = answer
+        self.ttft = ttft
+        self.token_delay = token_delay
+        self.verbose = verbose
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+def serve_in_thread(**kwargs) -> StandInServer:
+    """Start a stand-in server on a free port in the background; returns it (see .base_url)."""
+    server = StandInServer(**kwargs)
+    threading.Thread(target=server.serve_forever, name="slm-standin", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI Responses API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ttft", type=float, default=0.4, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.03, help="seconds between tokens")
+    parser.add_argument("--answer", default=DEFAULT_ANSWER)
+    parser.add_argument("--fail-first", type=int, default=0, help="fail this many answers first")
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds on failures")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = StandInServer(args.port, args.answer, args.ttft, args.token_delay, args.verbose,
+                           args.fail_first, args.fail_status, args.retry_after)
+    print(f"AquaGuide stand-in listening; use OPENAI_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,148 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from FrameProfiler import PROFILER
+from QueryIndex import STOPWORDS, SYNONYMS, stem
+
+# Marks offline answers so they are never cached as the model's
+OFFLINE_TAG = "[Offline tip] "
+
+# Lawn-care basics the offline guide always knows; the game adds its quiz
+# explanations and grass notes on top (see add_passages)
+KNOWLEDGE = [
+    "How often to water a lawn: deeply but not often, once or twice a week. Deep soakings push "
+    "roots down after the moisture, so the lawn rides out dry spells with less water.",
+    "Light, frequent watering keeps roots shallow near the surface, where the soil dries out first, "
+    "so the lawn gets thirstier and weaker.",
+    "Water in the early morning. Less is lost to evaporation and wind, and the grass dries during "
+    "the day, which lowers the risk of fungus and disease.",
+    "Skip watering when it has rained recently or rain is on the way; a rain gauge or a rain "
+    "sensor on the sprinkler keeps you from watering a wet lawn.",
+    "About three quarters of an inch to an inch of water per session is plenty for most Florida "
+    "lawns. Put a few cans on the lawn to see how long your sprinklers take to fill them.",
+    "Mow high: a taller mowing height shades the soil, keeps it cooler and moister, crowds out weeds, "
+    "and grows deeper roots. Never cut off more than a third of the blade at once.",
+    "Mowing too often or too short (scalping) stresses grass, weakens roots and makes the lawn "
+    "need more water.",
+    "Leave grass clippings on the lawn. They break down quickly and return nutrients and "
+    "moisture to the soil, so you need less fertilizer.",
+    "Deep roots reach water stored lower in the soil, so a deep-rooted lawn needs watering "
+    "less often and survives droughts better.",
+    "Grass types differ in how much water they need: Bahia and Zoysia need the least, "
+    "St. Augustine the most. Picking a drought-tolerant grass saves water every week.",
+    "The Floridan Aquifer is the underground layer of porous limestone that supplies most of "
+    "Florida's drinking water. Every gallon not sprinkled on a lawn stays in it.",
+    "Pumping too much from the aquifer lowers the water table, which can cause sinkholes and "
+    "let saltwater seep into freshwater wells.",
+    "Mulch around plants and trees holds moisture in the soil, keeps roots cool and smothers "
+    "weeds, so beds and the lawn next to them need less watering.",
+    "Healthy soil with organic matter such as compost soaks up and holds water like a sponge. "
+    "Aerating compacted soil lets water reach the roots instead of running off.",
+    "Use slow-release fertilizer sparingly and never before heavy rain; runoff carries nitrogen "
+    "and phosphorus into lakes and springs and feeds algae blooms.",
+    "Rain barrels and cisterns catch roof runoff for watering plants, easing demand on the aquifer.",
+    "A lawn that turns a little brown in a drought is usually dormant, not dead; warm-season "
+    "grasses green up again once rain returns.",
+]
+
+# Guideline bullets about how to answer, not about lawns
+_META = re.compile(r"\b(user|respond|tone|advice|brief|guide|mention|engage|simulat\w*|game|tips?)\b", re.I)
+
+
+def tokenize(text: str) -> List[str]:
+    """Content words, with the same stopwords, synonyms and stemming as QueryIndex."""
+    words = re.findall(r"[a-z0-9]+", text.lower().replace("'", ""))
+    return [stem(SYNONYMS.get(w, w)) for w in words if w not in STOPWORDS]
+
+
+def guideline_passages(system_prompt: str) -> List[str]:
+    """The lawn-care facts among the system prompt's "- " guideline bullets."""
+    _, _, guidelines = system_prompt.partition("Guidelines:")
+    passages = []
+    for line in guidelines.splitlines():
+        line = line.strip()
+        if not line.startswith("- ") or _META.search(line):
+            continue
+        text = line[2:].strip()
+        if text.startswith("Encourage "):
+            text = "Aim for " + text[len("Encourage "):]
+        passages.append(text)
+    return passages
+
+
+class OfflineGuide:
+    """
+    AquaGuide without a network: answers from a local lawn-care knowledge
+    base in a millisecond or two, for lab machines with no internet or no
+    API key, and as the hedge when the model is slow.
+    - Passages are ranked with BM25 (k1, b) over the same tokens QueryIndex
+      uses; answer() returns the best one, plus the runner-up when it
+      scores close, tagged with OFFLINE_TAG.
+    - Questions that match nothing get a friendly nudge toward topics it
+      does know.
+    - add_passages() grows the knowledge base at any time (the game adds
+      its quiz explanations and grass notes at startup).
+    """
+
+    FALLBACK = ("I can't reach my full answers right now, but ask me about watering, mowing, "
+                "roots, grass types, mulch or the Floridan Aquifer!")
+
+    def __init__(self, passages: Iterable[str] = (), k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._passages: List[str] = []
+        self._lengths: List[int] = []
+        self._postings: Dict[str, Dict[int, int]] = {}   # term -> {passage: term count}
+        self.add_passages(passages)
+
+    def __len__(self) -> int:
+        return len(self._passages)
+
+    def add_passages(self, passages: Iterable[str]):
+        with self._lock:
+            for text in passages:
+                text = text.strip()
+                if not text or text in self._passages:
+                    continue
+                doc = len(self._passages)
+                terms = Counter(tokenize(text))
+                self._passages.append(text)
+                self._lengths.append(sum(terms.values()))
+                for term, count in terms.items():
+                    self._postings.setdefault(term, {})[doc] = count
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[float, str]]:
+        """Top `k` (score, passage) pairs for `query`, best first; empty if nothing matches."""
+        with self._lock:
+            n = len(self._passages)
+            if not n:
+                return []
+            avg_len = sum(self._lengths) / n
+            scores: Dict[int, float] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1.0 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc, tf in postings.items():
+                    norm = self.k1 * (1.0 - self.b + self.b * self._lengths[doc] / avg_len)
+                    scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+            best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            return [(score, self._passages[doc]) for doc, score in best]
+
+    def answer(self, query: str) -> str:
+        with PROFILER.section("slm.offline"):
+            hits = self.search(query, k=2)
+        if not hits:
+            return OFFLINE_TAG + self.FALLBACK
+        text = hits[0][1]
+        if len(hits) > 1 and hits[1][0] >= 0.75 * hits[0][0]:
+            text += " " + hits[1][1]
+        return OFFLINE_TAG + text
+
+
+OFFLINE = OfflineGuide(KNOWLEDGE)
@@ -0,0 +1,179 @@
+import hashlib
+import math
+import random
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from ResponseCache import normalize_query
+
+
+# Words that carry no meaning of their own in a lawn question
+STOPWORDS = frozenset("""
+a about am an and any are as at be been being best can could do does doing for from get
+had has have how i if in is it its it's me my of on or our should so than that the
+their them then there these this those to too was we what what's when where which who
+why will with would you your yours tell explain please
+""".split())
+
+# What a question asks for: stopwords for similarity, but two questions only
+# match when they ask with the same ones ("when..." is not "why...")
+QUESTION_WORDS = frozenset("how what whats when where which who whom whose why".split())
+
+# Different words for the same thing, folded before n-gramming
+SYNONYMS = {
+    "frequently": "often", "frequent": "often", "regularly": "often",
+    "yard": "lawn", "grass": "lawn", "turf": "lawn",
+    "irrigate": "water", "irrigation": "water", "sprinkle": "water", "sprinkler": "water",
+    "rain": "rainy", "raining": "rainy", "rained": "rainy",
+    "least": "less", "fewest": "less", "minimum": "less",
+}
+
+
+def stem(word: str) -> str:
+    """Crude suffix trim so water/watering/watered share their trigrams."""
+    for suffix in ("ing", "ed", "es", "s", "ly"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def question_words(query: str) -> FrozenSet[str]:
+    """The QUESTION_WORDS in a query ("what's" counts as "what")."""
+    words = normalize_query(query).replace("'", "").split()
+    return frozenset("what" if w == "whats" else w for w in words if w in QUESTION_WORDS)
+
+
+def char_ngrams(query: str, n: int = 3) -> Tuple[str, ...]:
+    """Distinct character n-grams of the query's content words, each padded with spaces."""
+    words = [stem(SYNONYMS.get(w, w)) for w in normalize_query(query).replace("'", "").split()
+             if w not in STOPWORDS and w not in QUESTION_WORDS]
+    text = " " + " ".join(words) + " "
+    return tuple(sorted({text[i:i + n] for i in range(len(text) - n + 1)}))
+
+
+class QueryIndex:
+    """
+    Finds an earlier question that means the same as a new one, so its
+    cached answer can be reused ("how often should I water" ~ "how
+    frequently to water my lawn").
+    - Questions are sets of character trigrams weighted by IDF; similarity
+      is their cosine, and match() only answers at or above `threshold`.
+    - Candidates come from MinHash LSH: a `bands` x `rows` signature per
+      question, one bucket per band. Questions with similar trigram sets
+      share a bucket with high probability, so a lookup scores a handful of
+      entries however large the index is (very loose paraphrases can be
+      missed; that only costs a cache miss).
+    - A bucket stops taking entries at `bucket_cap`; one that full holds
+      near-copies of the same question, so more of them add nothing.
+    - Entries live in a `scope` (model, prompt, game context...) and only
+      match questions asked in the same scope, with the same question words.
+    - IDF shifts as entries are added; entry norms are refreshed in bulk
+      each time the index grows by a quarter, never during match().
+    """
+
+    def __init__(self, threshold: float = 0.8, bands: int = 10, rows: int = 3,
+                 bucket_cap: int = 16, seed: int = 1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.bucket_cap = bucket_cap
+        rng = random.Random(seed)
+        self._masks = [rng.getrandbits(64) for _ in range(bands * rows)]
+
+        self._lock = threading.Lock()
+        self._df: Dict[str, int] = {}
+        self._buckets: Dict[int, List[int]] = {}
+        self._grams: List[Tuple[str, ...]] = []
+        self._keys: List[str] = []
+        self._scopes: List[str] = []
+        self._asks: List[FrozenSet[str]] = []
+        self._norms: List[float] = []
+        self._normed_at = 0   # index size when the norms were last refreshed
+        self._by_key: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _band_keys(self, grams: Tuple[str, ...]) -> List[int]:
+        # XOR with a random mask permutes well-mixed 64-bit hashes; min() of each is one MinHash
+        hashes = [int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little")
+                  for g in grams]
+        sig = [min([h ^ m for h in hashes]) for m in self._masks]
+        r = self.rows
+        return [hash((band,) + tuple(sig[band * r:(band + 1) * r])) for band in range(self.bands)]
+
+    def _idf(self, gram: str) -> float:
+        return math.log((len(self._keys) + 1) / (self._df.get(gram, 0) + 1)) + 1.0
+
+    def _norm(self, grams: Tuple[str, ...]) -> float:
+        return math.sqrt(sum(self._idf(g) ** 2 for g in grams)) or 1.0
+
+    def _refresh_norms(self):
+        self._norms = [self._norm(grams) for grams in self._grams]
+        self._normed_at = len(self._keys)
+
+    def add(self, query: str, key: str, scope: str = ""):
+        """Index `query` as answered by cache entry `key` (re-adding a key is a no-op)."""
+        grams = char_ngrams(query)
+        if not grams:
+            return
+        band_keys = self._band_keys(grams)
+        with self._lock:
+            self._add(grams, band_keys, question_words(query), key, scope)
+            if len(self._keys) > self._normed_at * 1.25:
+                self._refresh_norms()
+
+    def _add(self, grams: Tuple[str, ...], band_keys: List[int], asks: FrozenSet[str],
+             key: str, scope: str):
+        if (scope, key) in self._by_key:
+            return
+        doc = len(self._keys)
+        self._by_key[(scope, key)] = doc
+        self._keys.append(key)
+        self._scopes.append(scope)
+        self._asks.append(asks)
+        self._grams.append(grams)
+        for g in grams:
+            self._df[g] = self._df.get(g, 0) + 1
+        for bk in band_keys:
+            bucket = self._buckets.setdefault(bk, [])
+            if len(bucket) < self.bucket_cap:
+                bucket.append(doc)
+        self._norms.append(self._norm(grams))
+
+    def match(self, query: str, scope: str = "") -> Optional[Tuple[str, float]]:
+        """(key, similarity) of the closest indexed question in `scope`, or None below threshold."""
+        grams = char_ngrams(query)
+        if not grams:
+            return None
+        band_keys = self._band_keys(grams)
+        asks = question_words(query)
+        with self._lock:
+            candidates = set()
+            for bk in band_keys:
+                candidates.update(self._buckets.get(bk, ()))
+            if not candidates:
+                return None
+            weights = {g: self._idf(g) ** 2 for g in grams}
+            q_norm = math.sqrt(sum(weights.values()))
+
+            best, best_score = None, 0.0
+            for doc in candidates:
+                if self._scopes[doc] != scope or self._asks[doc] != asks:
+                    continue
+                dot = sum(weights[g] for g in weights.keys() & self._grams[doc])
+                score = dot / (q_norm * self._norms[doc])
+                if score > best_score:
+                    best, best_score = doc, score
+            if best is None or best_score < self.threshold:
+                return None
+            return self._keys[best], min(best_score, 1.0)
+
+    def extend(self, entries: Iterable[Tuple[str, str, str]]):
+        """Bulk add of (query, key, scope) rows, e.g. from ResponseCache.queries()."""
+        rows = [(char_ngrams(q), question_words(q), key, scope) for q, key, scope in entries]
+        rows = [(grams, self._band_keys(grams), asks, key, scope) for grams, asks, key, scope in rows if grams]
+        with self._lock:
+            for grams, band_keys, asks, key, scope in rows:
+                self._add(grams, band_keys, asks, key, scope)
+            self._refresh_norms()
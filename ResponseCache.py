@@ -0,0 +1,140 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """Case, spacing and trailing punctuation don't make a different question."""
+    return re.sub(r"\s+", " ", query).strip().strip("?!. ").lower()
+
+
+class ResponseCache:
+    """
+    On-disk (SQLite) cache of AquaGuide answers, shared by every session
+    that points at the same file.
+    - key(): sha256 of model, temperature, system prompt, context and the
+      normalized question, so any change to what the model would see misses.
+    - Up to `variants_per_key` different answers are kept per key; lookup()
+      misses until that many exist, then serves them in turn.
+    - Entries expire `ttl_s` after they were stored; beyond `max_entries`
+      the least recently used answers are evicted.
+    - single_flight(key) lets concurrent askers of the same question wait for
+      one API call instead of making their own.
+    - The question behind each key is kept too (with its scope, the key of
+      everything but the question), so queries() can rebuild a QueryIndex
+      for near-duplicate lookups.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key       TEXT    NOT NULL,
+            variant   INTEGER NOT NULL,
+            text      TEXT    NOT NULL,
+            created   REAL    NOT NULL,
+            last_used REAL    NOT NULL,
+            hits      INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (key, variant)
+        );
+        CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used);
+        CREATE TABLE IF NOT EXISTS queries (
+            key   TEXT PRIMARY KEY,
+            scope TEXT NOT NULL,
+            query TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, ttl_s: float = 7 * 24 * 3600, max_entries: int = 2000,
+                 variants_per_key: int = 1):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.variants_per_key = max(1, variants_per_key)
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._flights = {}  # key -> [Lock held while one caller produces the answer, callers using it]
+        self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.executescript(self.SCHEMA)
+
+    @staticmethod
+    def key(model: str, temperature: float, system_prompt: str, context: str, query: str) -> str:
+        payload = json.dumps([model, temperature, system_prompt, context, normalize_query(query)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses WHERE key = ? AND created < ?", (key, now - self.ttl_s))
+            rows = self._db.execute(
+                "SELECT variant, text FROM responses WHERE key = ? ORDER BY last_used", (key,)).fetchall()
+            if len(rows) < self.variants_per_key:
+                self.misses += 1
+                return None
+            variant, text = rows[0]  # least recently served, so variants rotate
+            self._db.execute("UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ? AND variant = ?",
+                             (now, key, variant))
+            self.hits += 1
+            return text
+
+    def store(self, key: str, text: str, query: Optional[str] = None, scope: str = ""):
+        now = time.time()
+        with self._lock, self._db:
+            rows = self._db.execute(
+                "SELECT variant FROM responses WHERE key = ? ORDER BY created", (key,)).fetchall()
+            if len(rows) >= self.variants_per_key:
+                variant = rows[0][0]  # replace the oldest variant
+            else:
+                used = {r[0] for r in rows}
+                variant = next(i for i in range(len(rows) + 1) if i not in used)
+            self._db.execute("INSERT OR REPLACE INTO responses (key, variant, text, created, last_used, hits) "
+                             "VALUES (?, ?, ?, ?, ?, 0)", (key, variant, text, now, now))
+            if query is not None:
+                self._db.execute("INSERT OR REPLACE INTO queries (key, scope, query) VALUES (?, ?, ?)",
+                                 (key, scope, query))
+            self._evict()
+
+    def _evict(self):
+        count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            self._db.execute("DELETE FROM responses WHERE rowid IN "
+                             "(SELECT rowid FROM responses ORDER BY last_used LIMIT ?)", (count - self.max_entries,))
+            self._db.execute("DELETE FROM queries WHERE key NOT IN (SELECT key FROM responses)")
+
+    def queries(self) -> List[Tuple[str, str, str]]:
+        """(query, key, scope) for every question that still has an answer."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT query, key, scope FROM queries WHERE key IN (SELECT key FROM responses)").fetchall()
+
+    @contextmanager
+    def single_flight(self, key: str):
+        with self._lock:
+            flight = self._flights.setdefault(key, [threading.Lock(), 0])
+            flight[1] += 1
+        try:
+            with flight[0]:
+                yield
+        finally:
+            # Only the last caller out drops the lock; one still waiting holds on to it
+            with self._lock:
+                flight[1] -= 1
+                if not flight[1]:
+                    del self._flights[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {"entries": entries, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
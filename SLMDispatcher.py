@@ -0,0 +1,95 @@
+import itertools
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import pygame
+
+from FrameProfiler import PROFILER
+
+# Posted on the pygame event queue when a request finishes:
+# request_id, prompt, text, elapsed_ms, ttft_ms (None unless streamed)
+SLM_REPLY = pygame.event.custom_type()
+# Posted for each piece of a streamed answer: request_id, text
+SLM_CHUNK = pygame.event.custom_type()
+
+
+class SLMDispatcher:
+    """
+    Runs AquaGuide requests on worker threads so the frame loop never waits
+    on the network.
+    - submit(prompt) queues a request and returns its id, or None when
+      `max_in_flight` requests are already outstanding.
+    - Every finished request comes back as an SLM_REPLY event; errors come
+      back as reply text, the same way chat_with_slm reports them.
+    - With `ask_stream(prompt, on_text)` the answer also arrives piece by
+      piece as SLM_CHUNK events, and time to first token is recorded as
+      "slm.ttft" (measured from submit, so it includes any queueing).
+    - Workers are daemon threads, so quitting never waits on a slow request.
+    """
+
+    def __init__(self, ask: Callable[[str], str], workers: int = 2, max_in_flight: int = 4,
+                 ask_stream: Optional[Callable[[str, Callable[[str], None]], str]] = None):
+        self.ask = ask
+        self.ask_stream = ask_stream
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, float] = {}  # request id -> submit time
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._threads = []
+
+    def _start(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"slm-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, prompt: str) -> Optional[int]:
+        with self._lock:
+            if len(self._pending) >= self.max_in_flight:
+                return None
+            request_id = next(self._ids)
+            self._pending[request_id] = time.perf_counter()
+            if not self._threads:
+                self._start()
+        self._queue.put((request_id, prompt))
+        return request_id
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _work(self):
+        while True:
+            request_id, prompt = self._queue.get()
+            with self._lock:
+                submitted = self._pending.get(request_id, time.perf_counter())
+            PROFILER.record("slm.queue_wait", (time.perf_counter() - submitted) * 1000.0)
+            ttft = []
+
+            def on_text(chunk: str):
+                if not ttft:
+                    ttft.append((time.perf_counter() - submitted) * 1000.0)
+                    PROFILER.record("slm.ttft", ttft[0])
+                self._post(SLM_CHUNK, request_id=request_id, text=chunk)
+
+            try:
+                text = self.ask_stream(prompt, on_text) if self.ask_stream else self.ask(prompt)
+            except Exception as e:
+                text = f"[Error contacting SLM: {e}]"
+            elapsed_ms = (time.perf_counter() - submitted) * 1000.0
+            with self._lock:
+                self._pending.pop(request_id, None)
+            self._post(SLM_REPLY, request_id=request_id, prompt=prompt, text=text,
+                       elapsed_ms=elapsed_ms, ttft_ms=ttft[0] if ttft else None)
+
+    @staticmethod
+    def _post(event_type: int, **attrs):
+        try:
+            pygame.event.post(pygame.event.Event(event_type, **attrs))
+        except pygame.error:
+            pass  # display already shut down
@@ -0,0 +1,187 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional, TypeVar
+
+from FrameProfiler import PROFILER
+
+T = TypeVar("T")
+
+
+class QuotaExceeded(RuntimeError):
+    """This session has used up its model requests."""
+
+
+class TokenBucket:
+    """
+    `rate` tokens per second, holding at most `burst`; take() blocks until
+    one is free, and with `reserve` until one is free beyond that many.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, reserve: int = 0):
+        need = 1.0 + min(reserve, self.burst - 1)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= need:
+                    self._tokens -= 1.0
+                    return
+                wait = (need - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class SLMScheduler:
+    """
+    Sits in front of every model request so a student spamming Ask can't
+    flood the API (or the school's bill).
+    - slot(): counts against the session quota (QuotaExceeded once it is
+      spent), waits for the token bucket (`rate_per_min`, `burst`), then
+      holds one of `max_concurrent` slots for as long as the request runs
+      (a streamed answer keeps it until the stream ends).
+    - slot(background=True) is for fetches nobody is waiting on (prefetch):
+      they run `max_background` at a time, leave `background_reserve`
+      tokens and one slot free, and never start while a player's request
+      is waiting, so a typed question always goes first.
+    - with_retries(fn): retries 429 and 5xx responses up to `max_retries`
+      times with full-jitter exponential backoff (`base_delay` doubling up
+      to `max_delay`), or the server's Retry-After when it sends one.
+      Anything else is raised straight away.
+    - call(fn) is both. Waits are recorded as "slm.sched_wait"; queue
+      depth, retries and quota left are profiler counters.
+    """
+
+    def __init__(self, rate_per_min: float = 20.0, burst: int = 8, max_concurrent: int = 3,
+                 session_quota: int = 150, max_retries: int = 3,
+                 base_delay: float = 0.5, max_delay: float = 8.0,
+                 max_background: int = 1, background_reserve: int = 3):
+        self.bucket = TokenBucket(rate_per_min / 60.0, burst)
+        self.max_concurrent = max_concurrent
+        self.max_background = max_background
+        self.background_reserve = background_reserve
+        self.session_quota = session_quota
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.used = 0
+        self.waiting = 0
+        self.retries = 0
+        self.running = 0
+        self._interactive_waiting = 0
+        self._background_running = 0
+        self._lock = threading.Lock()
+        self._freed = threading.Condition(self._lock)
+
+    def _can_start(self, background: bool) -> bool:
+        if not background:
+            return self.running < self.max_concurrent
+        return (not self._interactive_waiting and self._background_running < self.max_background
+                and self.running < max(1, self.max_concurrent - 1))
+
+    @contextmanager
+    def slot(self, background: bool = False):
+        with self._lock:
+            if self.used >= self.session_quota:
+                raise QuotaExceeded(f"session quota of {self.session_quota} requests used up")
+            self.used += 1
+            self.waiting += 1
+            if not background:
+                self._interactive_waiting += 1
+            PROFILER.set_counter("slm quota left", self.session_quota - self.used)
+            PROFILER.set_counter("slm queue depth", self.waiting)
+        t0 = time.perf_counter()
+        try:
+            if background:
+                # Queue for a slot first, so the player's requests take tokens before this one
+                with self._freed:
+                    self._freed.wait_for(lambda: self._can_start(True))
+                    self._start(background)
+                try:
+                    self.bucket.take(reserve=self.background_reserve)
+                except BaseException:
+                    self._release(background)
+                    raise
+            else:
+                self.bucket.take()
+                with self._freed:
+                    self._freed.wait_for(lambda: self._can_start(False))
+                    self._start(background)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+                if not background:
+                    self._interactive_waiting -= 1
+                    self._freed.notify_all()
+                PROFILER.set_counter("slm queue depth", self.waiting)
+        PROFILER.record("slm.sched_wait", (time.perf_counter() - t0) * 1000.0)
+        try:
+            yield
+        finally:
+            self._release(background)
+
+    def _start(self, background: bool):
+        self.running += 1
+        if background:
+            self._background_running += 1
+
+    def _release(self, background: bool):
+        with self._freed:
+            self.running -= 1
+            if background:
+                self._background_running -= 1
+            self._freed.notify_all()
+
+    @staticmethod
+    def retryable(exc: Exception) -> bool:
+        status = getattr(exc, "status_code", None)
+        return status == 429 or (isinstance(status, int) and status >= 500)
+
+    def with_retries(self, fn: Callable[[], T]) -> T:
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not self.retryable(e):
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = random.uniform(0.0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                    PROFILER.set_counter("slm retries", self.retries)
+                time.sleep(min(delay, self.max_delay))
+
+    def call(self, fn: Callable[[], T], background: bool = False) -> T:
+        with self.slot(background):
+            return self.with_retries(fn)
+
+
+# ELD_SLM_RATE (requests/minute), ELD_SLM_CONCURRENCY and ELD_SLM_QUOTA
+# (requests per session) tune it for a classroom
+SCHEDULER = SLMScheduler(
+    rate_per_min=float(os.environ.get("ELD_SLM_RATE", "20")),
+    max_concurrent=int(os.environ.get("ELD_SLM_CONCURRENCY", "3")),
+    session_quota=int(os.environ.get("ELD_SLM_QUOTA", "150")),
+)
@@ -1,11 +1,61 @@
 from __future__ import annotations
+import importlib
 import os
-from typing import Optional, Dict, Any
-from openai import OpenAI
-from dotenv import load_dotenv
+import threading
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+
+# openai and python-dotenv are imported on first use, so importing this
+# module (and the game with it) doesn't pay for the SDK up front.
+_env_loaded = False
+_clients: Dict[Tuple, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def load_env() -> None:
+    """Load .env if present (once; skipped when python-dotenv isn't installed)."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+
+def _pooled_http_client():
+    """
+    The SDK's default HTTP client with a pool sized for a few workers and a
+    long keep-alive, so questions a minute apart reuse one TLS connection.
+    None (SDK defaults) when the SDK's HTTP library can't be found.
+    """
+    import openai
+    for factory, module in (("DefaultHttpxClient", "httpx"), ("DefaultHttpx2Client", "httpx2")):
+        if not hasattr(openai, factory):
+            continue
+        try:
+            http = importlib.import_module(module)
+        except ImportError:
+            continue
+        return getattr(openai, factory)(
+            limits=http.Limits(max_connections=8, max_keepalive_connections=4, keepalive_expiry=90.0))
+    return None
+
+
+def shared_client(api_key: str, timeout: float, base_url: Optional[str] = None, max_retries: int = 2):
+    """One OpenAI client per (key, base URL, timeout, retries) for the whole process, built on first use."""
+    key = (api_key, base_url, timeout, max_retries)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            from openai import OpenAI
+            # base_url=None keeps the SDK default (or OPENAI_BASE_URL, e.g. LocalSLMServer)
+            client = OpenAI(api_key=api_key, timeout=timeout, base_url=base_url, max_retries=max_retries,
+                            http_client=_pooled_http_client())
+            _clients[key] = client
+    return client
 
-# Load .env if present
-load_dotenv()
 
 SYSTEM_PROMPT = """You are AquaGuide, a friendly, eco-conscious advisor.
 Your role is to give helpful, conversational advice about:
@@ -39,29 +89,92 @@ class GameGuide:
         model: str = "gpt-4o-mini",
         request_timeout: float = 30.0,
         temperature: float = 0.6,
+        base_url: Optional[str] = None,
+        max_retries: int = 2,
     ) -> None:
+        load_env()
         api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY is not set. Export it or put it in a .env file.")
-        self.client = OpenAI(api_key=api_key, timeout=request_timeout)
+        # max_retries=0 when the caller retries itself (ChatWithSLMNew's scheduler)
+        self._client_args = (api_key, request_timeout, base_url, max_retries)
         self.model = model
         self.temperature = temperature
+        self._context_memo: Tuple[Any, str] = (None, "")   # (game_state items, hints)
 
-    def generate_tip(
-        self,
-        player_query: str,
-        game_state: Optional[Dict[str, Any]] = None
-    ) -> str:
+    @property
+    def client(self):
+        """The shared OpenAI client (created, importing openai, on first use)."""
+        return shared_client(*self._client_args)
+
+    def warm_up(self) -> threading.Thread:
         """
-        Generate conversational advice (paragraph style).
-        Optionally include game_state as background context,
-        but it will not be mentioned directly.
+        Build the client and open a pooled connection to the API on a
+        background thread, so the first question skips the SDK import, the
+        TCP/TLS handshake and the SDK's first-parse model building.
         """
+        def run():
+            try:
+                self.client.with_options(max_retries=0).models.list()
+            except Exception:
+                pass  # offline or refused: the first real request will report it
+            try:
+                from openai.types.responses import (
+                    Response, ResponseCompletedEvent, ResponseCreatedEvent, ResponseTextDeltaEvent)
+                # pydantic builds these validators lazily, ~1 s on the first reply otherwise
+                for model in (Response, ResponseCreatedEvent, ResponseTextDeltaEvent, ResponseCompletedEvent):
+                    model.model_rebuild()
+            except Exception:
+                pass  # other SDK versions: nothing to prebuild
+
+        thread = threading.Thread(target=run, name="slm-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def build_context(self, game_state: Optional[Dict[str, Any]] = None) -> str:
+        """
+        game_state as natural-language background hints ("" without one).
+        Numbers are put into coarse words (shallow roots, a falling aquifer),
+        so similar lawns share a context and its cached answers; the hints
+        are rebuilt only when game_state differs from the last call's.
+        """
+        if not game_state:
+            return ""
+        items = tuple(sorted(game_state.items()))
+        memo_items, memo_context = self._context_memo
+        if items == memo_items:
+            return memo_context
+        context = self._hints(game_state)
+        self._context_memo = (items, context)
+        return context
+
+    @staticmethod
+    def _hints(game_state: Dict[str, Any]) -> str:
         context = ""
-        #did not actually get around to implementing
         if game_state:
             # Convert state dict into natural-language hints (not stats).
             hints = []
+            if "grass" in game_state:
+                note = game_state.get("grass_note", "").rstrip(".")
+                hints.append(f"Their lawn is {game_state['grass']} grass" + (f" ({note[:1].lower() + note[1:]})." if note else "."))
+            if "watering" in game_state:
+                amount, _, often = game_state["watering"].lower().partition(" ")
+                how = {"light": "lightly", "heavy": "heavily"}.get(amount, amount)
+                when = {"frequent": "often", "infrequent": "only now and then"}.get(often, often)
+                hints.append(f"They water {how} and {when}.")
+            if "aquifer_level" in game_state:
+                level = game_state["aquifer_level"]
+                state = "healthy" if level >= 70 else "getting low" if level >= 40 else "dangerously low"
+                change = game_state.get("aquifer_change")
+                trend = ("" if change is None else ", and it is dropping fast" if change <= -8
+                         else ", and it is slowly dropping" if change < 0 else ", and it is holding steady")
+                hints.append(f"The aquifer under them is {state}{trend}.")
+            if "root_depth" in game_state:
+                depth = game_state["root_depth"]
+                roots = "very shallow" if depth <= 3 else "shallow" if depth <= 6 else "fairly deep" if depth <= 12 else "deep"
+                hints.append(f"Their grass roots are {roots}.")
+            if "month" in game_state:
+                hints.append(f"They are in month {game_state['month']} of a 12-month year of lawn care.")
             if "season" in game_state:
                 hints.append(f"It's currently {game_state['season']}.")
             if "recent_rain_mm" in game_state and game_state["recent_rain_mm"] > 0:
@@ -72,17 +185,64 @@ class GameGuide:
                 hints.append(f"The soil type is {game_state['soil_type']}.")
             if hints:
                 context = "Background context: " + " ".join(hints)
+        return context
 
+    def _build_input(
+        self,
+        player_query: str,
+        game_state: Optional[Dict[str, Any]] = None,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        System prompt, earlier conversation (history messages, e.g. from
+        ConversationMemory) and the player question, with game_state folded
+        in as background hints.
+        """
+        context = self.build_context(game_state)
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            *(history or ()),
+            {"role": "user", "content": f"{context}\n\nPlayer question: {player_query}"}
+        ]
+
+    def generate_tip(
+        self,
+        player_query: str,
+        game_state: Optional[Dict[str, Any]] = None,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> str:
+        """
+        Generate conversational advice (paragraph style).
+        Optionally include game_state as background context,
+        but it will not be mentioned directly, and history as
+        the earlier conversation.
+        """
         resp = self.client.responses.create(
             model=self.model,
-            input=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": f"{context}\n\nPlayer question: {player_query}"}
-            ],
+            input=self._build_input(player_query, game_state, history),
             temperature=self.temperature,
         )
         return resp.output_text.strip()
 
+    def stream_tip(
+        self,
+        player_query: str,
+        game_state: Optional[Dict[str, Any]] = None,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Iterator[str]:
+        """
+        Same request as generate_tip(), streamed. The request is sent right
+        away (so HTTP errors raise here); the returned iterator yields text
+        deltas as the model produces them.
+        """
+        stream = self.client.responses.create(
+            model=self.model,
+            input=self._build_input(player_query, game_state, history),
+            temperature=self.temperature,
+            stream=True,
+        )
+        return (event.delta for event in stream if event.type == "response.output_text.delta")
+
 
 # ---------- Example manual test ----------
 if __name__ == "__main__":
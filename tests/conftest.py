@@ -0,0 +1,11 @@
+import os
+import sys
+
+# The game's modules live flat in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# EveryLastDrop opens its window and mixer on import: keep both headless,
+# and keep AquaGuide offline with no cache file
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("ELD_RESPONSE_CACHE", "off")
@@ -0,0 +1,26 @@
+import pygame
+import pytest
+
+from AssetManager import AssetManager
+
+
+@pytest.fixture
+def assets(tmp_path):
+    pygame.image.save(pygame.Surface((4, 4)), str(tmp_path / "tile.png"))
+    return AssetManager(str(tmp_path))
+
+
+def test_hits_and_misses(assets):
+    assert assets.image("tile.png") is not None
+    assert assets.image("tile.png") is not None
+    stats = assets.stats()
+    assert (stats["hits"], stats["misses"], stats["missing"]) == (1, 1, 0)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_known_missing_file_is_not_a_hit(assets):
+    for _ in range(3):
+        assert assets.image("nope.png") is None
+    stats = assets.stats()
+    assert (stats["hits"], stats["misses"], stats["missing"]) == (0, 1, 2)
+    assert stats["hit_rate"] == 0.0
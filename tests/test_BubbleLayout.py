@@ -0,0 +1,56 @@
+import random
+
+import pygame
+import pytest
+
+E = pytest.importorskip("EveryLastDrop")
+
+ANSWER = ("Water deeply but not often, once or twice a week, early in the morning.\n"
+          "Mow high and leave the clippings: they return moisture and nutrients to the soil.\n\n"
+          "Bahia and Zoysia need the least water; St. Augustine needs the most. "
+          "Supercalifragilisticexpialidociouslylonggrasswordthatcannotwrap then short words.")
+
+
+def layout():
+    return E.BubbleLayout("AquaGuide", E.FONT, 300, (30, 30, 30))
+
+
+def pixels(bubble):
+    return [None if s is None else pygame.image.tobytes(s, "RGBA") for s in bubble.surfaces]
+
+
+def test_offsets_point_at_each_line():
+    for line, start in E.wrap_with_offsets(ANSWER, E.FONT, 300):
+        if line != "<PARA_BREAK>":
+            assert ANSWER[start:].startswith(line)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_streamed_chunks_wrap_like_the_whole_text(seed):
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, len(ANSWER)), rng.randint(1, 40)))
+    streamed = layout()
+    for end in cuts + [len(ANSWER)]:
+        streamed.set_text(ANSWER[:end])
+    whole = layout()
+    whole.set_text(ANSWER)
+    assert streamed.lines == whole.lines
+    assert streamed.height == whole.height
+    assert pixels(streamed) == pixels(whole)
+
+
+def test_only_the_last_line_is_rewrapped():
+    bubble = layout()
+    bubble.set_text(ANSWER[:150])
+    kept = bubble.surfaces[:-1]
+    bubble.set_text(ANSWER[:160])
+    assert all(a is b for a, b in zip(kept, bubble.surfaces))
+
+
+def test_replaced_text_is_wrapped_from_scratch():
+    bubble = layout()
+    bubble.set_text("Thinking...")
+    bubble.set_text(ANSWER)
+    whole = layout()
+    whole.set_text(ANSWER)
+    assert bubble.lines == whole.lines
@@ -0,0 +1,38 @@
+import types
+
+import pytest
+
+C = pytest.importorskip("ChatWithSLMNew")
+from ResponseCache import ResponseCache
+
+
+@pytest.fixture
+def chat(tmp_path, monkeypatch):
+    guide = types.SimpleNamespace(model="m", temperature=0.0,
+                                  build_context=lambda state: repr(sorted(state.items())))
+    responses = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(C, "guide", guide)
+    monkeypatch.setattr(C, "_responses", responses)
+    monkeypatch.setattr(C, "_responses_opened", True)
+    monkeypatch.setattr(C, "_semantic_threshold", "off")
+    monkeypatch.setattr(C, "_game_state", {})
+    monkeypatch.setattr(C, "_canned_state", {})
+    monkeypatch.setattr(C, "_warm", C.OrderedDict())
+    monkeypatch.setattr(C, "canned_prompts", set())
+    yield C
+    responses.close()
+
+
+def test_answer_is_stored_under_the_state_it_was_asked_with(chat, monkeypatch):
+    chat.set_game_state({"month": 3})
+    asked = chat._cache_keys("How often?")
+
+    def ask(*args, **kwargs):
+        chat.set_game_state({"month": 4})  # the game moves on while the model answers
+        return "Twice a week."
+
+    monkeypatch.setattr(chat, "_ask", ask)
+    assert chat._answer("How often?") == "Twice a week."
+    assert chat._responses.lookup(asked[0]) == "Twice a week."
+    assert chat._responses.queries() == [("How often?", asked[0], asked[1])]
+    assert chat.cached_answer("How often?") is None  # month 4 hasn't been asked
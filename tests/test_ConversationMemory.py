@@ -0,0 +1,72 @@
+import pytest
+
+from ConversationMemory import ConversationMemory, estimate_tokens, refers_back
+
+
+@pytest.mark.parametrize("question", [
+    "What about in summer?",
+    "Why is that?",
+    "what about it",
+    "And the aquifer?",
+    "Tell me more",
+    "Are they drought tolerant?",
+    "How do I do that?",
+    "Is that normal in July?",
+    "You said once a week, but how long each time?",
+])
+def test_follow_ups_refer_back(question):
+    assert refers_back(question)
+
+
+@pytest.mark.parametrize("question", [
+    "How often should I water my lawn?",
+    "What grass needs the least water?",
+    "When is the best time to mow?",
+    "Why should I water in the morning?",
+    "What is the Floridan Aquifer?",
+    "Is it OK to water at night?",
+    "What is the best grass for Florida that needs little water?",
+    "Should I mow more often in summer?",
+    "Is there a way to save water?",
+    "Mulch?",
+    "Which one needs the least water, Bahia or Zoysia?",
+    "What did people do before sprinklers?",
+])
+def test_standalone_questions_do_not(question):
+    assert not refers_back(question)
+
+
+def test_recent_turns_are_verbatim():
+    memory = ConversationMemory()
+    memory.add_turn("How often should I water?", "Once or twice a week, deeply.")
+    assert memory.messages() == [
+        {"role": "user", "content": "How often should I water?"},
+        {"role": "assistant", "content": "Once or twice a week, deeply."},
+    ]
+    assert len(memory) == 1
+
+
+def test_old_turns_are_summarized_within_budget():
+    memory = ConversationMemory(budget_tokens=120, summary_tokens=60)
+    answer = "Great question! Deep watering once a week grows roots that reach stored water. " * 2
+    for i in range(200):
+        memory.add_turn(f"Question number {i} about watering?", answer)
+    messages = memory.messages()
+    assert messages[0]["role"] == "system"
+    assert "Great question" not in messages[0]["content"]
+    assert estimate_tokens(messages[0]["content"]) <= 60 + 20
+    assert memory.tokens() <= 120 + 80
+    assert messages[-2]["content"] == "Question number 199 about watering?"
+
+
+def test_latest_turn_is_kept_however_long():
+    memory = ConversationMemory(budget_tokens=10)
+    memory.add_turn("short", "x" * 400)
+    assert len(memory) == 1
+
+
+def test_clear():
+    memory = ConversationMemory()
+    memory.add_turn("q", "a")
+    memory.clear()
+    assert memory.messages() == [] and len(memory) == 0
@@ -0,0 +1,43 @@
+import pygame
+import pytest
+
+E = pytest.importorskip("EveryLastDrop")
+
+
+def panes():
+    chat = E.ChatUI(E.CHAT_RECT, (E.FONT, E.TITLE_FONT, E.BUTTON_FONT))
+    lawn = E.WaterWisePane(E.GAME_RECT, chat)
+    return chat, lawn
+
+
+def pane_pixels(surface, rect):
+    return pygame.image.tobytes(surface.subsurface(rect), "RGB")
+
+
+def test_game_over_freezes_only_the_lawn():
+    chat, lawn = panes()
+    lawn.state.in_game_over = True
+    surface = pygame.Surface((E.TOTAL_W, E.TOTAL_H))
+    assert lawn.draw(surface) == "over"
+    assert lawn.end_frame.get_size() == E.GAME_RECT.size
+
+    lawn.state.lawn.health = 0  # would redraw differently if the pane weren't frozen
+    again = pygame.Surface((E.TOTAL_W, E.TOTAL_H))
+    assert lawn.draw(again) == "over"
+    assert pane_pixels(again, E.GAME_RECT) == pane_pixels(surface, E.GAME_RECT)
+
+
+def test_late_answer_shows_after_game_over():
+    chat, lawn = panes()
+    chat.pending_replies[7] = len(chat.chat_history)
+    chat.chat_history.append(("AquaGuide", "Thinking..."))
+    lawn.state.in_game_over = True
+    surface = pygame.Surface((E.TOTAL_W, E.TOTAL_H))
+    chat.draw(surface)
+    lawn.draw(surface)
+    before = pane_pixels(surface, E.CHAT_RECT)
+
+    chat.handle_event(pygame.event.Event(E.SLM_CHUNK, request_id=7, text="Water at dawn."))
+    chat.draw(surface)
+    lawn.draw(surface)
+    assert pane_pixels(surface, E.CHAT_RECT) != before
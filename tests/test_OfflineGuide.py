@@ -0,0 +1,51 @@
+import pytest
+
+from OfflineGuide import KNOWLEDGE, OFFLINE_TAG, OfflineGuide, guideline_passages, tokenize
+
+
+@pytest.fixture
+def offline():
+    return OfflineGuide(KNOWLEDGE)
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("How often should I water my lawn?", "once or twice a week"),
+    ("What time of day is best for watering?", "early morning"),
+    ("How high should I mow?", "Mow high"),
+    ("What is the Floridan Aquifer?", "porous limestone"),
+    ("Which grass needs the least water?", "Bahia and Zoysia"),
+])
+def test_answers_from_the_knowledge_base(offline, question, expected):
+    answer = offline.answer(question)
+    assert answer.startswith(OFFLINE_TAG)
+    assert expected in answer
+
+
+def test_unknown_question_gets_the_fallback(offline):
+    assert offline.answer("Who won the football game?") == OFFLINE_TAG + OfflineGuide.FALLBACK
+
+
+def test_add_passages_skips_duplicates_and_blanks(offline):
+    size = len(offline)
+    offline.add_passages([KNOWLEDGE[0], "  ", "Bahia grass: Drought-tolerant, lowest water need."])
+    assert len(offline) == size + 1
+    assert "Bahia grass" in offline.search("bahia drought", k=1)[0][1]
+
+
+def test_search_is_ranked_best_first(offline):
+    scores = [score for score, _ in offline.search("water deeply roots", k=3)]
+    assert scores == sorted(scores, reverse=True) and len(scores) == 3
+
+
+def test_guideline_passages_keep_lawn_facts_only():
+    prompt = ("You are AquaGuide.\nGuidelines:\n"
+              "- Keep responses brief and friendly.\n"
+              "- Encourage deep, infrequent watering.\n"
+              "- Mention the simulator when relevant.\n"
+              "- Mulch holds moisture in the soil.\n")
+    assert guideline_passages(prompt) == ["Aim for deep, infrequent watering.",
+                                          "Mulch holds moisture in the soil."]
+
+
+def test_tokenize_folds_synonyms_and_stems():
+    assert tokenize("Watering the yard") == tokenize("water lawn")
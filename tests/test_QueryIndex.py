@@ -0,0 +1,59 @@
+import pytest
+
+from QueryIndex import QueryIndex, char_ngrams, question_words
+
+
+@pytest.fixture
+def index():
+    idx = QueryIndex()
+    idx.add("How often should I water my lawn?", "often")
+    idx.add("When should I water my lawn?", "when")
+    return idx
+
+
+def test_paraphrase_matches(index):
+    key, score = index.match("how frequently to water my lawn")
+    assert key == "often"
+    assert index.threshold <= score <= 1.0
+
+
+def test_same_question_new_wording_matches(index):
+    assert index.match("when should i water my yard")[0] == "when"
+
+
+@pytest.mark.parametrize("query", [
+    "Why should I water my lawn?",
+    "How should I water my lawn?",
+    "Where should I water my lawn?",
+    "Should I water my lawn?",
+])
+def test_different_question_word_does_not_match(index, query):
+    assert index.match(query) is None
+
+
+def test_scope_separates_entries():
+    idx = QueryIndex()
+    idx.add("How often should I water my lawn?", "k", scope="a")
+    assert idx.match("how often to water my lawn", scope="b") is None
+    assert idx.match("how often to water my lawn", scope="a")[0] == "k"
+
+
+def test_extend_matches_like_add():
+    idx = QueryIndex()
+    idx.extend([("How often should I water my lawn?", "often", ""),
+                ("What grass needs the least water?", "grass", "")])
+    assert len(idx) == 2
+    assert idx.match("what's the grass that needs the least water")[0] == "grass"
+    assert idx.match("why should I water my lawn") is None
+
+
+def test_readding_a_key_is_a_noop(index):
+    index.add("How often should I water my lawn?", "often")
+    assert len(index) == 2
+
+
+def test_question_words_and_ngrams():
+    assert question_words("What's the best time?") == {"what"}
+    assert question_words("Should I mow?") == frozenset()
+    assert char_ngrams("How often?") == char_ngrams("how  often")
+    assert char_ngrams("the a of") == ()
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+from ResponseCache import ResponseCache, normalize_query
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    yield cache
+    cache.close()
+
+
+def test_key_ignores_case_spacing_and_punctuation():
+    args = ("gpt-4o-mini", 0.6, "prompt", "context")
+    assert ResponseCache.key(*args, "How often  should I water?") == ResponseCache.key(*args, "how often should i water")
+    assert ResponseCache.key(*args, "How often?") != ResponseCache.key(*args[:3], "other context", "How often?")
+    assert normalize_query("  Why?! ") == "why"
+
+
+def test_store_and_lookup(cache):
+    assert cache.lookup("k") is None
+    cache.store("k", "answer", query="How often?", scope="s")
+    assert cache.lookup("k") == "answer"
+    assert cache.queries() == [("How often?", "k", "s")]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), ttl_s=-1)
+    cache.store("k", "answer")
+    assert cache.lookup("k") is None
+
+
+def test_eviction_drops_least_recently_used_and_its_query(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), max_entries=2)
+    cache.store("a", "A", query="qa")
+    time.sleep(0.01)
+    cache.store("b", "B", query="qb")
+    time.sleep(0.01)
+    cache.lookup("a")
+    time.sleep(0.01)
+    cache.store("c", "C", query="qc")
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") == "A" and cache.lookup("c") == "C"
+    assert sorted(q for q, _, _ in cache.queries()) == ["qa", "qc"]
+
+
+def test_variants_rotate(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), variants_per_key=2)
+    cache.store("k", "one")
+    assert cache.lookup("k") is None   # misses until both variants exist
+    time.sleep(0.01)
+    cache.store("k", "two")
+    served = {cache.lookup("k") for _ in range(2)}
+    assert served == {"one", "two"}
+
+
+def test_single_flight_runs_one_caller_at_a_time(cache):
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def ask(delay):
+        time.sleep(delay)
+        with cache.single_flight("k"):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+    # The second caller is still waiting when the first leaves; the third
+    # arrives while the second holds the flight
+    threads = [threading.Thread(target=ask, args=(delay,)) for delay in (0.0, 0.01, 0.07)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 1
+    assert not cache._flights
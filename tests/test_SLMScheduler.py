@@ -0,0 +1,140 @@
+import threading
+import time
+
+import pytest
+
+import SLMScheduler
+from SLMScheduler import QuotaExceeded, SLMScheduler as Scheduler, TokenBucket
+
+
+class APIError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": {} if retry_after is None
+                                              else {"retry-after": str(retry_after)}})()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(SLMScheduler.time, "sleep", slept.append)
+    return slept
+
+
+def flaky(*errors):
+    errors = list(errors)
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+    return call
+
+
+def test_retries_429_and_5xx_then_succeeds(sleeps):
+    sched = Scheduler(max_retries=3, base_delay=0.5, max_delay=8)
+    assert sched.with_retries(flaky(APIError(503), APIError(429))) == "ok"
+    assert sched.retries == 2
+    assert len(sleeps) == 2 and all(0 <= s <= 1.0 for s in sleeps)
+
+
+def test_retry_after_is_honoured_up_to_max_delay(sleeps):
+    sched = Scheduler(max_delay=8)
+    sched.with_retries(flaky(APIError(429, retry_after=3), APIError(429, retry_after=60)))
+    assert sleeps == [3.0, 8.0]
+
+
+def test_gives_up_after_max_retries(sleeps):
+    sched = Scheduler(max_retries=2)
+    with pytest.raises(APIError):
+        sched.with_retries(flaky(*[APIError(500)] * 3))
+    assert len(sleeps) == 2
+
+
+def test_other_errors_are_not_retried(sleeps):
+    sched = Scheduler()
+    with pytest.raises(APIError):
+        sched.with_retries(flaky(APIError(400)))
+    with pytest.raises(ValueError):
+        sched.with_retries(flaky(ValueError("bad")))
+    assert sleeps == []
+
+
+def test_session_quota():
+    sched = Scheduler(session_quota=2, rate_per_min=6000)
+    assert sched.call(lambda: 1) == 1 and sched.call(lambda: 2) == 2
+    with pytest.raises(QuotaExceeded):
+        sched.call(lambda: 3)
+
+
+def test_concurrency_is_capped():
+    sched = Scheduler(max_concurrent=2, rate_per_min=60000, burst=20)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    threads = [threading.Thread(target=sched.call, args=(work,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
+
+
+def test_token_bucket_spaces_requests_after_the_burst():
+    bucket = TokenBucket(rate=50.0, burst=2)
+    t0 = time.monotonic()
+    for _ in range(5):
+        bucket.take()
+    # two free, then three at 20 ms each
+    assert 0.05 <= time.monotonic() - t0 < 0.5
+
+
+def test_player_gets_a_slot_during_a_background_refill():
+    sched = Scheduler()   # the game's defaults: 20/min, burst 8, 3 slots
+    background_peak, running = [0], [0]
+    lock = threading.Lock()
+
+    def prefetch():
+        with lock:
+            running[0] += 1
+            background_peak[0] = max(background_peak[0], running[0])
+        time.sleep(0.3)
+        with lock:
+            running[0] -= 1
+
+    refill = [threading.Thread(target=sched.call, args=(prefetch,), kwargs={"background": True})
+              for _ in range(4)]
+    for t in refill:
+        t.start()
+    time.sleep(0.05)
+    t0 = time.monotonic()
+    with sched.slot():
+        waited = time.monotonic() - t0
+    # Well inside the 3 s hedge window (ELD_OFFLINE_AFTER): no queueing behind the refill
+    assert waited < 0.1
+    for t in refill:
+        t.join()
+    assert background_peak[0] == 1
+
+
+def test_background_waits_for_waiting_players():
+    sched = Scheduler(max_concurrent=2, rate_per_min=60000, burst=20)
+    order = []
+    with sched.slot():   # one player request running; the background one may not take the last slot
+        worker = threading.Thread(target=sched.call, args=(lambda: order.append("background"),),
+                                  kwargs={"background": True})
+        worker.start()
+        time.sleep(0.05)
+        assert order == []
+        sched.call(lambda: order.append("player"))
+    worker.join()
+    assert order == ["player", "background"]
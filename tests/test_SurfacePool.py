@@ -0,0 +1,67 @@
+import pygame
+import pytest
+
+E = pytest.importorskip("EveryLastDrop")
+
+
+@pytest.fixture
+def pool():
+    return E.SurfacePool(max_cached=4)
+
+
+def test_text_renders_once_per_label(pool):
+    first = pool.text(E.FONT, "Ask", (0, 0, 0))
+    assert pool.text(E.FONT, "Ask", (0, 0, 0)) is first
+    assert pool.text(E.FONT, "Ask", (1, 0, 0)) is not first
+    assert pool.allocations == 2
+
+
+def test_caches_are_capped(pool):
+    for i in range(10):
+        pool.text(E.FONT, str(i), (0, 0, 0))
+    assert len(pool._texts) == 4
+
+
+def test_steady_state_chat_frames_allocate_nothing():
+    chat = E.ChatUI(E.CHAT_RECT, (E.FONT, E.TITLE_FONT, E.BUTTON_FONT))
+    for i in range(8):
+        chat.chat_history.append(("You", f"Question {i}?"))
+        chat.chat_history.append(("AquaGuide", "Water deeply but not often. " * 20))
+    chat.input_text = "how deep should my roots be " * 3
+    for _ in range(5):
+        chat.draw(E.screen)
+    before = E.SURFACE_POOL.allocations
+    for i in range(60):
+        chat.scroll_offset = (i * 37) % 900   # the scrollbar thumb moves but keeps its size
+        chat.draw(E.screen)
+    assert E.SURFACE_POOL.allocations == before
+
+
+def test_scrollbar_thumb_is_keyed_by_width_only():
+    chat = E.ChatUI(E.CHAT_RECT, (E.FONT, E.TITLE_FONT, E.BUTTON_FONT))
+    filled = len(E.SURFACE_POOL._filled)
+    for n in range(4, 40, 3):
+        chat.chat_history[:] = [("AquaGuide", "Mow high. " * 10)] * n
+        chat._bubbles.clear()
+        chat.draw(E.screen)
+    assert len(E.SURFACE_POOL._filled) <= filled + 1
+
+
+def test_caches_drop_the_least_recently_used(pool):
+    hot = pool.text(E.FONT, "AquaGuide", (0, 0, 0))
+    for i in range(10):
+        pool.text(E.FONT, str(i), (0, 0, 0))
+        assert pool.text(E.FONT, "AquaGuide", (0, 0, 0)) is hot   # used every frame: stays
+
+
+def test_typing_does_not_crowd_the_text_cache():
+    chat = E.ChatUI(E.CHAT_RECT, (E.FONT, E.TITLE_FONT, E.BUTTON_FONT))
+    chat.draw(E.screen)
+    texts = len(E.SURFACE_POOL._texts)
+    before = E.SURFACE_POOL.allocations
+    for ch in "how deep should my roots grow?":
+        chat.input_text += ch
+        chat.draw(E.screen)
+        chat.draw(E.screen)   # an unchanged input line is not rendered again
+    assert len(E.SURFACE_POOL._texts) == texts
+    assert E.SURFACE_POOL.allocations - before == len("how deep should my roots grow?")